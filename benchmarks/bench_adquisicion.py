@@ -0,0 +1,127 @@
+import os, sys, json, time, platform, tempfile, contextlib, io
+from datetime import datetime
+import numpy as np
+from core.adc_spi import adquirir_bloques, MAX_TRANSFERENCIAS
+from core.adquirircsv import adquirir_csv
+from core.adquisicion_stream import AdquisicionStream
+from core.fuentes_adc import FuenteSimulada
+from utils.senal_sintetica import auscultacion, a_codigos
+
+# Escenarios: (nombre, fs nominal, latencia por lectura, jitter por lectura)
+ESCENARIOS = (
+    ("ideal_8k", 8000, 0.0, 0.0),
+    ("ideal_44k", 44100, 0.0, 0.0),
+    ("ioctl_8k", 8000, 0.002, 0.001),
+    # Lecturas más lentas que la conversión: la FIFO del ADC se desborda
+    ("atrasado_44k", 44100, 0.015, 0.005),
+)
+DURACION_S = 3.0
+FIFO = 4096
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+class FuenteCronometrada(FuenteSimulada):
+    # Guarda el instante en que se entrega cada lectura para medir el jitter
+    def abrir(self):
+        self.marcas = []
+        self.tamanos = []
+        super().abrir()
+        self.inicio = self._t0
+        return self
+
+    def leer_bloque(self, n, salida=None):
+        salida = super().leer_bloque(n, salida)
+        self.marcas.append(time.perf_counter())
+        self.tamanos.append(n)
+        return salida
+
+def estadisticas(fuente, fs, total_s, muestras, perdidas_buffer=0):
+    # Tasa efectiva (entregadas por la fuente desde que se abrió) y dispersión
+    # del intervalo entre lecturas respecto al ideal
+    marcas, tamanos = np.array(fuente.marcas), np.array(fuente.tamanos)
+    duracion = marcas[-1] - fuente.inicio if len(marcas) else 0.0
+    intervalos = np.diff(marcas)
+    ideales = tamanos[1:] / fs
+    desvio = (intervalos - ideales) * 1000 if len(intervalos) else np.zeros(1)
+    return {"fs_nominal": fs, "muestras": int(muestras), "duracion_s": duracion, "total_s": total_s,
+            "tasa_efectiva": muestras / duracion if duracion else 0.0,
+            "lecturas": len(marcas),
+            "jitter_ms_std": float(np.std(desvio)),
+            "jitter_ms_p99": float(np.percentile(np.abs(desvio), 99)),
+            "perdidas_fuente": int(fuente.perdidas),
+            "perdidas_buffer": int(perdidas_buffer)}
+
+def crear_fuente(codigos, fs, latencia, jitter):
+    return FuenteCronometrada(codigos, fs, latencia, jitter, fifo=FIFO)
+
+def medir_bloques(directorio, codigos, fs, latencia, jitter, duracion):
+    fuente = crear_fuente(codigos, fs, latencia, jitter)
+    n = int(duracion * fs)
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        adquirir_bloques(n, os.path.join(directorio, "bloques.ausc"), MAX_TRANSFERENCIAS, fuente)
+    return estadisticas(fuente, fs, time.perf_counter() - t, n)
+
+def medir_muestra(directorio, codigos, fs, latencia, jitter, duracion):
+    # Lectura muestra a muestra como con gpiozero: la latencia es por muestra
+    fuente = crear_fuente(codigos, fs, latencia / MAX_TRANSFERENCIAS, jitter / MAX_TRANSFERENCIAS)
+    n = int(duracion * fs)
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        adquirir_csv(n, os.path.join(directorio, "muestra.ausc"), fuente)
+    return estadisticas(fuente, fs, time.perf_counter() - t, n)
+
+def medir_stream(directorio, codigos, fs, latencia, jitter, duracion):
+    fuente = crear_fuente(codigos, fs, latencia, jitter)
+    n = int(duracion * fs)
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stream = AdquisicionStream(os.path.join(directorio, "stream.ausc"), n, fuente).iniciar()
+        stream.esperar()
+    return estadisticas(fuente, fs, time.perf_counter() - t, stream.buffer.escritas,
+                        stream.buffer.perdidas)
+
+MOTORES = {"bloques": medir_bloques, "muestra": medir_muestra, "stream": medir_stream}
+
+def ejecutar(duracion=DURACION_S, escenarios=ESCENARIOS, motores=tuple(MOTORES)):
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="bench_adq_") as directorio:
+        for nombre, fs, latencia, jitter in escenarios:
+            codigos = a_codigos(auscultacion(min(duracion, 10.0), fs)[1])
+            for motor in motores:
+                fila = {"escenario": nombre, "motor": motor, "latencia_s": latencia, "jitter_s": jitter,
+                        **MOTORES[motor](directorio, codigos, fs, latencia, jitter, duracion)}
+                print(f"  {nombre:<14} {motor:<8} {fila['tasa_efectiva']:9.0f} Hz / {fs} Hz"
+                      f"  jitter {fila['jitter_ms_std']:6.2f} ms (p99 {fila['jitter_ms_p99']:6.2f})"
+                      f"  perdidas {fila['perdidas_fuente']}+{fila['perdidas_buffer']}")
+                resultados.append(fila)
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "sistema": {"plataforma": platform.platform(), "maquina": platform.machine(),
+                    "python": platform.python_version(), "cpus": os.cpu_count()},
+        "fifo": FIFO,
+        "resultados": resultados,
+    }
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    if argumentos[:1] in (["-h"], ["--help"]):
+        print("Uso: python -m benchmarks.bench_adquisicion [duracion_s] [motores] [salida.json]")
+        print("     python -m benchmarks.bench_adquisicion 3 bloques,stream")
+        sys.exit(0)
+
+    duracion = float(argumentos[0]) if argumentos else DURACION_S
+    motores = tuple(argumentos[1].split(",")) if len(argumentos) > 1 else tuple(MOTORES)
+    if len(argumentos) > 2:
+        salida = argumentos[2]
+    else:
+        os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+        salida = os.path.join(DIRECTORIO_RESULTADOS,
+                              f"adquisicion_{platform.node()}_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+    reporte = ejecutar(duracion, motores=motores)
+    with open(salida, "w") as f:
+        json.dump(reporte, f, indent=2)
+    print(f"Resultados guardados en '{salida}'")
@@ -0,0 +1,179 @@
+import matplotlib
+matplotlib.use("Agg")
+
+import os, sys, gc, json, time, platform, tempfile, statistics
+from datetime import datetime
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from core import cargar_graficar_csv, fft_csv, dwt_csv, csv_to_wav, predict, remuestreo
+from core.basedatos import BaseDatos
+from core.cargar_senal import cargar_senal, limpiar_cache
+from core.formato_bin import escribir_bin, exportar_csv, EXTENSION
+from utils.senal_sintetica import auscultacion, a_codigos, FS
+
+# Duraciones de las señales sintéticas (s): 10 s, 1 min y 10 min
+DURACIONES = (10, 60, 600)
+REPETICIONES = 3
+# Pacientes y señales por paciente para las pruebas de base de datos
+PACIENTES = 2000
+SENALES_POR_PACIENTE = 5
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+def medir(nombre, funcion, repeticiones=REPETICIONES, preparar=None, **info):
+    # preparar() se ejecuta antes de cada repetición sin contar en el tiempo
+    # (p. ej. vaciar la caché para medir la carga en frío)
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        # Sin recolecciones pendientes de la preparación dentro de la medición
+        gc.collect()
+        t = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t)
+        if isinstance(resultado, Figure):
+            plt.close(resultado)
+
+    fila = {"prueba": nombre, **info, "repeticiones": repeticiones,
+            "min_s": min(tiempos), "mediana_s": statistics.median(tiempos),
+            "media_s": statistics.fmean(tiempos)}
+    detalle = " ".join(f"{k}={v}" for k, v in info.items())
+    print(f"  {nombre:<28} {detalle:<24} mediana {fila['mediana_s'] * 1000:10.1f} ms")
+    return fila
+
+def preparar_senal(directorio, duracion, fs=FS):
+    _, voltios = auscultacion(duracion, fs)
+    base = os.path.join(directorio, f"sintetica_{duracion}s")
+    path_bin = escribir_bin(base + EXTENSION, a_codigos(voltios), fs, 3.0, 1.5, 0.0)
+    path_csv = exportar_csv(path_bin, base + ".csv")
+    path_wav = csv_to_wav.csv_to_wav(path_csv)
+    return path_csv, path_bin, path_wav
+
+def en_frio():
+    # Vacía la caché de carga y la de señales regularizadas
+    limpiar_cache()
+    remuestreo.limpiar_cache()
+
+def irregular(duracion, fs=FS, jitter=0.1):
+    rng = np.random.default_rng(0)
+    tiempo = np.cumsum(rng.uniform(1 - jitter, 1 + jitter, int(duracion * fs))) / fs
+    return tiempo, auscultacion(duracion, fs)[1][:len(tiempo)]
+
+def bench_senales(directorio, duraciones, repeticiones):
+    resultados = []
+    for duracion in duraciones:
+        print(f"Señal sintética de {duracion} s ({duracion * FS} muestras)")
+        path_csv, path_bin, path_wav = preparar_senal(directorio, duracion)
+        info = {"duracion_s": duracion, "muestras": duracion * FS}
+
+        for formato, path in (("csv", path_csv), ("ausc", path_bin)):
+            # En frío: incluye la lectura del archivo
+            resultados.append(medir(f"plot_g1[{formato}]", lambda: cargar_graficar_csv.plot_g1(path),
+                                    repeticiones, limpiar_cache, **info))
+        # En caliente: el CSV ya está en la caché de carga (el bucle anterior la vacía)
+        resultados.append(medir("plot_g1[caché]", lambda: cargar_graficar_csv.plot_g1(path_csv),
+                                repeticiones, lambda: cargar_senal(path_csv), **info))
+        resultados.append(medir("plot_fft", lambda: fft_csv.plot_fft(path_csv),
+                                repeticiones, en_frio, **info))
+        resultados.append(medir("plot_wavelet", lambda: dwt_csv.plot_wavelet(path_csv),
+                                repeticiones, lambda: (en_frio(), dwt_csv._cache.clear()), **info))
+        resultados.append(medir("csv_to_wav", lambda: csv_to_wav.csv_to_wav(path_csv),
+                                repeticiones, en_frio, **info))
+        # Marcas con jitter como las de time.time() en adquirir_csv
+        tiempo, voltios = irregular(duracion)
+        resultados.append(medir("a_rejilla", lambda: remuestreo.a_rejilla(tiempo, voltios, FS),
+                                repeticiones, **info))
+        resultados.append(medir("a_tasa[44100]", lambda: remuestreo.a_tasa(voltios, FS, 44100),
+                                repeticiones, **info))
+        resultados.append(medir("extract_features", lambda: predict.extract_features(path_wav),
+                                repeticiones, **info))
+        resultados.append(medir("predict_audio", lambda: predict.predict_audio(path_wav),
+                                repeticiones, **info))
+    return resultados
+
+def bench_basedatos(directorio, repeticiones, pacientes=PACIENTES, por_paciente=SENALES_POR_PACIENTE):
+    print(f"Base de datos temporal ({pacientes} pacientes, {por_paciente} señales c/u)")
+    bd = BaseDatos(os.path.join(directorio, "bench.db"))
+    metadatos = {"duracion": 10.0, "fs": float(FS), "num_muestras": 10 * FS, "v_min": -0.5,
+                 "v_max": 0.5, "rms": 0.1, "f_dominante": 250.0}
+    info = {"pacientes": pacientes}
+
+    contador = {"n": 0}
+    def registrar_todos():
+        # Cada repetición registra pacientes nuevos (los NIT no se repiten)
+        base = contador["n"] * pacientes
+        contador["n"] += 1
+        for i in range(base, base + pacientes):
+            archivos = [f"/datos/{i}_{k}.csv" for k in range(por_paciente)]
+            bd.guardar_usuario(str(10_000_000 + i), f"Nombre{i % 97}", f"Apellido{i % 389}", 40,
+                               f"p{i}@correo.com", archivos, [metadatos] * por_paciente)
+
+    resultados = [medir("bd.guardar_usuario", registrar_todos, repeticiones, **info)]
+    nits = [str(10_000_000 + i) for i in range(0, pacientes, max(pacientes // 200, 1))]
+    resultados.append(medir("bd.buscar_usuario", lambda: [bd.buscar_usuario(n) for n in nits],
+                            repeticiones, consultas=len(nits), **info))
+    resultados.append(medir("bd.senales_detalle", lambda: [bd.senales_detalle(n) for n in nits],
+                            repeticiones, consultas=len(nits), **info))
+    consultas = ["100", "Apellido1", "nombre5 apellido3", "Nom"]
+    resultados.append(medir("bd.buscar_pacientes", lambda: [bd.buscar_pacientes(q) for q in consultas],
+                            repeticiones, consultas=len(consultas), fts=bd.fts, **info))
+    bd.cerrar()
+    return resultados
+
+def ejecutar(duraciones=DURACIONES, repeticiones=REPETICIONES):
+    # Carga del modelo, importación de librosa y compilación JIT fuera de las mediciones
+    predict.obtener_modelo()
+    predict.extract_features_senal(auscultacion(1)[1], FS)
+    with tempfile.TemporaryDirectory(prefix="bench_ausc_") as directorio:
+        resultados = bench_senales(directorio, duraciones, repeticiones)
+        resultados += bench_basedatos(directorio, repeticiones)
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "sistema": {"plataforma": platform.platform(), "maquina": platform.machine(),
+                    "python": platform.python_version(), "numpy": np.__version__,
+                    "cpus": os.cpu_count()},
+        "fs": FS,
+        "resultados": resultados,
+    }
+
+def comparar(path_base, path_nuevo):
+    # Cociente de medianas nuevo/base por prueba (> 1 es más lento)
+    with open(path_base) as f:
+        base = {(r["prueba"], r.get("duracion_s")): r for r in json.load(f)["resultados"]}
+    with open(path_nuevo) as f:
+        nuevo = json.load(f)["resultados"]
+    for r in nuevo:
+        clave = (r["prueba"], r.get("duracion_s"))
+        if clave in base:
+            cociente = r["mediana_s"] / base[clave]["mediana_s"]
+            aviso = "  <-- más lento" if cociente > 1.2 else ""
+            print(f"{r['prueba']:<28} {str(clave[1] or ''):>5} {cociente:6.2f}x{aviso}")
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    if argumentos[:1] == ["--comparar"] and len(argumentos) == 3:
+        comparar(argumentos[1], argumentos[2])
+        sys.exit(0)
+    if argumentos[:1] in (["-h"], ["--help"]):
+        print("Uso: python -m benchmarks.bench_core [duraciones_s] [repeticiones] [salida.json]")
+        print("     python -m benchmarks.bench_core 10,60,600 3")
+        print("     python -m benchmarks.bench_core --comparar base.json nuevo.json")
+        sys.exit(0)
+
+    duraciones = tuple(int(d) for d in argumentos[0].split(",")) if argumentos else DURACIONES
+    repeticiones = int(argumentos[1]) if len(argumentos) > 1 else REPETICIONES
+    if len(argumentos) > 2:
+        salida = argumentos[2]
+    else:
+        os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+        salida = os.path.join(DIRECTORIO_RESULTADOS,
+                              f"bench_{platform.node()}_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+    reporte = ejecutar(duraciones, repeticiones)
+    with open(salida, "w") as f:
+        json.dump(reporte, f, indent=2)
+    print(f"Resultados guardados en '{salida}'")
@@ -0,0 +1,150 @@
+import time, fcntl, sys
+import numpy as np
+from core.adquirircsv import guardar_adquisicion
+from core.fuentes_adc import FuenteAdc
+from utils import trazas
+
+# Máximo de conversiones por mensaje SPI: el campo de tamaño del ioctl es de
+# 14 bits (511 transferencias de 32 bytes) y spidev limita el buffer a 4096 bytes
+MAX_TRANSFERENCIAS = 511
+BYTES_POR_MUESTRA = 3
+
+# struct spi_ioc_transfer de <linux/spi/spidev.h>
+_SPI_IOC_TRANSFER = np.dtype([
+    ("tx_buf", "<u8"), ("rx_buf", "<u8"),
+    ("len", "<u4"), ("speed_hz", "<u4"),
+    ("delay_usecs", "<u2"), ("bits_per_word", "u1"), ("cs_change", "u1"),
+    ("tx_nbits", "u1"), ("rx_nbits", "u1"), ("word_delay_usecs", "u1"), ("pad", "u1"),
+])
+
+def _spi_ioc_message(n):
+    # _IOW('k', 0, char[n * sizeof(struct spi_ioc_transfer)])
+    return (1 << 30) | ((n * _SPI_IOC_TRANSFER.itemsize) << 16) | (ord('k') << 8)
+
+def comando_mcp3202(canal=0):
+    # Bit de inicio + (SGL=1, ODD=canal, MSBF=1)
+    return [0x01, 0xA0 | (canal << 6), 0x00]
+
+def decodificar_mcp3202(rx):
+    # rx: bytes recibidos, 3 por conversión -> códigos de 12 bits
+    rx = rx.reshape(-1, BYTES_POR_MUESTRA)
+    return ((rx[:, 1].astype(np.uint16) & 0x0F) << 8) | rx[:, 2]
+
+class LectorSpi(FuenteAdc):
+    # Uso exclusivo del bus mientras dure la captura (el monitor no sondea)
+    usa_bus_spi = True
+
+    def __init__(self, bus=0, device=0, canal=0, velocidad_hz=1000000, retardo_us=0):
+        self.bus = bus
+        self.device = device
+        self.canal = canal
+        self.velocidad_hz = velocidad_hz
+        self.retardo_us = retardo_us
+        self.spi = None
+        self.por_lotes = True
+
+    def abrir(self):
+        import spidev
+        self.spi = spidev.SpiDev()
+        self.spi.open(self.bus, self.device)
+        self.spi.max_speed_hz = self.velocidad_hz
+        self.spi.mode = 0
+
+        # Buffers reutilizados en cada lote: un comando por conversión y una
+        # transferencia por conversión para que CS baje entre muestras
+        self._tx = np.tile(np.array(comando_mcp3202(self.canal), dtype=np.uint8), MAX_TRANSFERENCIAS)
+        self._rx = np.zeros_like(self._tx)
+        self._xfers = np.zeros(MAX_TRANSFERENCIAS, dtype=_SPI_IOC_TRANSFER)
+        desplazamientos = np.arange(MAX_TRANSFERENCIAS, dtype=np.uint64) * BYTES_POR_MUESTRA
+        self._xfers["tx_buf"] = self._tx.ctypes.data + desplazamientos
+        self._xfers["rx_buf"] = self._rx.ctypes.data + desplazamientos
+        self._xfers["len"] = BYTES_POR_MUESTRA
+        self._xfers["speed_hz"] = self.velocidad_hz
+        self._xfers["delay_usecs"] = self.retardo_us
+        self._xfers["bits_per_word"] = 8
+        self._xfers["cs_change"] = 1
+        return self
+
+    def cerrar(self):
+        if self.spi is not None:
+            self.spi.close()
+            self.spi = None
+
+    def _lote_ioctl(self, n):
+        # En la última transferencia cs_change=1 dejaría CS activo
+        self._xfers["cs_change"][n - 1] = 0
+        try:
+            fcntl.ioctl(self.spi.fileno(), _spi_ioc_message(n), self._xfers)
+        finally:
+            self._xfers["cs_change"][n - 1] = 1
+        return decodificar_mcp3202(self._rx[:n * BYTES_POR_MUESTRA])
+
+    def _lote_xfer2(self, n):
+        comando = comando_mcp3202(self.canal)
+        rx = np.array([self.spi.xfer2(comando) for _ in range(n)], dtype=np.uint8)
+        return decodificar_mcp3202(rx)
+
+    def leer_bloque(self, n, salida=None):
+        if salida is None:
+            salida = np.empty(n, dtype=np.uint16)
+
+        i = 0
+        while i < n:
+            k = min(MAX_TRANSFERENCIAS, n - i)
+            if self.por_lotes:
+                try:
+                    salida[i:i + k] = self._lote_ioctl(k)
+                except OSError:
+                    # Controlador sin soporte de mensajes múltiples
+                    self.por_lotes = False
+                    continue
+            else:
+                salida[i:i + k] = self._lote_xfer2(k)
+            i += k
+
+        return salida
+
+def tiempos_por_muestra(num_muestras, inicios_bloque, tiempos_bloque, tiempo_fin):
+    # Interpola un tiempo por muestra a partir de las marcas de cada bloque
+    xp = np.append(inicios_bloque, num_muestras)
+    fp = np.append(tiempos_bloque, tiempo_fin)
+    return np.interp(np.arange(num_muestras), xp, fp)
+
+def adquirir_bloques(num_muestras, nombre_archivo, tam_bloque=MAX_TRANSFERENCIAS, lector=None):
+    lector = lector or LectorSpi()
+
+    print(f"Iniciando recolección de {num_muestras} muestras (SPI por bloques)")
+    codigos = np.empty(num_muestras, dtype=np.uint16)
+    inicios_bloque = np.arange(0, num_muestras, tam_bloque)
+    tiempos_bloque = np.empty(len(inicios_bloque))
+
+    with lector:
+        inicio_tiempo = time.time()
+        try:
+            for b, i in enumerate(inicios_bloque):
+                tiempos_bloque[b] = time.time() - inicio_tiempo
+                with trazas.tramo("leer_bloque", "adquisicion"):
+                    lector.leer_bloque(min(tam_bloque, num_muestras - i), codigos[i:i + tam_bloque])
+
+        except KeyboardInterrupt:
+            print("Recolección interrumpida por el usuario.")
+            sys.exit(0)
+
+        duracion = time.time() - inicio_tiempo
+
+    fs = num_muestras / duracion
+    print(f"Recolección completada en {duracion:.2f} segundos.")
+    print(f"Tasa de muestreo alcanzada: {fs:.2f} Hz")
+    if not lector.por_lotes:
+        print("Aviso: el controlador SPI no admite lotes, se usó xfer2 por muestra.")
+    if getattr(lector, "perdidas", 0):
+        print(f"Aviso: la fuente descartó {lector.perdidas} muestras por lectura atrasada.")
+
+    # Dispersión de la tasa entre bloques (jitter)
+    if len(inicios_bloque) > 2:
+        tasas = np.diff(inicios_bloque) / np.diff(tiempos_bloque)
+        print(f"Tasa por bloque: {np.min(tasas):.0f}-{np.max(tasas):.0f} Hz")
+
+    tiempos = tiempos_por_muestra(num_muestras, inicios_bloque, tiempos_bloque, duracion)
+    guardar_adquisicion(nombre_archivo, tiempos, codigos, inicio_tiempo)
+    return fs
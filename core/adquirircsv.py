@@ -1,53 +1,81 @@
 import time, csv, sys 
 import numpy as np
-from gpiozero import MCP3202
+from core.formato_bin import es_binario, escribir_bin
+from core.fuentes_adc import FuenteGpiozero
+from core import sesion
+from utils import trazas
 
-def adquirir_csv(num_muestras, nombre_archivo):
-    # Configuración del ADC
-    adc = MCP3202(channel=0, device=0) 
+# Parámetros de conversión a Voltios 
+VREF = 3.0
+NUM_BITS = 12
+OFFSET = 1.5
 
-    # Parámetros de conversión a Voltios 
-    vref = 3.0
-    num_bits = 4096.0
-    to_volts = vref / num_bits
-    offset = 1.5
-
-    # Inicio del muestreo
-    print(f"Iniciando recolección de {num_muestras} muestras")
-    datos = []
-    inicio_tiempo = time.time()
-
-    try:
-        for i in range(num_muestras):
-            # Leer el canal 0 (A0)
-            voltios = (adc.value * vref) - offset
-            
-            # Tiempo total de muestreo
-            tiempo_actual = time.time() - inicio_tiempo
-            datos.append([tiempo_actual, voltios]) 
-
-    except KeyboardInterrupt:
-        print("Recolección interrumpida por el usuario.")
-        sys.exit(0)
-
-    fin_tiempo = time.time()
-    duracion = fin_tiempo - inicio_tiempo
-    print(f"Recolección completada en {duracion:.2f} segundos.")
-    print(f"Tasa de muestreo aproximada: {num_muestras / duracion:.2f} Hz")
+@trazas.trazar("adquisicion")
+def guardar_adquisicion(nombre_archivo, tiempos, codigos, inicio, vref=VREF, offset=OFFSET, bits=NUM_BITS):
+    tiempos = np.asarray(tiempos, dtype=np.float64)
+    codigos = np.asarray(codigos)
+    to_volts = vref / (2 ** bits - 1)
+    voltios = codigos * to_volts - offset
 
     # Verificar si se aplicó el offset
-    media_final = np.mean([d[1] for d in datos])
+    media_final = np.mean(voltios)
     print(f"Media de los datos adquiridos (verificación de offset): {media_final:.4f}V")
-    datos_corregidos = [[t, v - media_final] for t, v in datos]
 
-    # Guardar los datos en un archivo CSV
+    # La señal queda en memoria para clasificarla sin releer el archivo
+    # (cargar_senal arrastra scipy: se importa aquí y no al abrir la pestaña).
+    # Las marcas de time.time() no son uniformes: se publica ya en rejilla uniforme
+    from core.cargar_senal import Senal
+    from core.remuestreo import uniformizar
+    duracion = tiempos[-1] - tiempos[0] if len(tiempos) > 1 else 0.0
+    fs = (len(tiempos) - 1) / duracion if duracion > 0 else 0.0
+    sesion.publicar(sesion.ADQUISICION, uniformizar(Senal(tiempos, voltios - media_final, fs, nombre_archivo)))
+
     try:
-        with open(nombre_archivo, mode='w', newline='') as archivo_csv:
-            escritor_csv = csv.writer(archivo_csv)
-            escritor_csv.writerow(['tiempo', 'voltios']) 
-            escritor_csv.writerows(datos_corregidos)
+        if es_binario(nombre_archivo):
+            # En binario se guardan los códigos crudos y la corrección de
+            # offset queda en la cabecera
+            escribir_bin(nombre_archivo, codigos, fs, vref, offset + media_final, inicio, bits)
+        else:
+            # Guardar los datos en un archivo CSV
+            with open(nombre_archivo, mode='w', newline='') as archivo_csv:
+                escritor_csv = csv.writer(archivo_csv)
+                escritor_csv.writerow(['tiempo', 'voltios']) 
+                escritor_csv.writerows(zip(tiempos.tolist(), (voltios - media_final).tolist()))
 
         print(f"Datos guardados en '{nombre_archivo}'")
 
     except PermissionError:
         print(f"ERROR DE PERMISOS: No se pudo escribir en '{nombre_archivo}'")
+
+def adquirir_csv(num_muestras, nombre_archivo, fuente=None):
+    # Por defecto el MCP3202 con gpiozero; cualquier FuenteAdc sirve (p. ej. la simulada)
+    fuente = fuente or FuenteGpiozero(canal=0, device=0)
+
+    # El bus queda reservado mientras el ADC está abierto (el monitor no sondea)
+    with fuente:
+        # Inicio del muestreo
+        print(f"Iniciando recolección de {num_muestras} muestras")
+        tiempos = []
+        codigos = []
+        inicio_tiempo = time.time()
+
+        try:
+            # Un solo tramo para todo el bucle: por muestra costaría más que la lectura
+            with trazas.tramo("adquirir_csv", "adquisicion", muestras=num_muestras):
+                for i in range(num_muestras):
+                    # Leer el canal 0 (A0) como código crudo del ADC
+                    codigos.append(fuente.leer_muestra())
+
+                    # Tiempo total de muestreo
+                    tiempos.append(time.time() - inicio_tiempo)
+
+        except KeyboardInterrupt:
+            print("Recolección interrumpida por el usuario.")
+            sys.exit(0)
+
+    fin_tiempo = time.time()
+    duracion = fin_tiempo - inicio_tiempo
+    print(f"Recolección completada en {duracion:.2f} segundos.")
+    print(f"Tasa de muestreo aproximada: {num_muestras / duracion:.2f} Hz")
+
+    guardar_adquisicion(nombre_archivo, tiempos, codigos, inicio_tiempo)
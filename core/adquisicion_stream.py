@@ -0,0 +1,237 @@
+import time, os, threading
+import numpy as np
+from core.adc_spi import LectorSpi, MAX_TRANSFERENCIAS
+from core.adquirircsv import VREF, NUM_BITS, OFFSET
+from core.formato_bin import EXTENSION, es_binario, empaquetar_cabecera, exportar_csv
+from core import sesion
+from utils import trazas
+
+# Parámetros del modo continuo
+CAPACIDAD_BUFFER = 1 << 18      # muestras en el buffer circular
+TAM_CHUNK = 1 << 14             # muestras por escritura a disco
+CHUNKS_POR_FSYNC = 8            # escrituras entre cada fsync
+
+class BufferCircular:
+    def __init__(self, capacidad=CAPACIDAD_BUFFER, dtype=np.uint16):
+        self.datos = np.zeros(capacidad, dtype=dtype)
+        self.capacidad = capacidad
+        self.escritas = 0
+        self.leidas = 0
+        self.perdidas = 0
+        self._cond = threading.Condition()
+
+    @property
+    def pendientes(self):
+        return self.escritas - self.leidas
+
+    @property
+    def ocupacion(self):
+        return self.pendientes / self.capacidad
+
+    def escribir(self, bloque):
+        # El productor nunca se bloquea: si el consumidor se atrasa más que la
+        # capacidad, se descartan las muestras más antiguas y se contabilizan
+        with self._cond:
+            if len(bloque) > self.capacidad:
+                # La cabeza del bloque se descarta sin escribirla; se cuenta
+                # como perdida abajo, junto con lo que el bloque sobrescriba
+                self.escritas += len(bloque) - self.capacidad
+                bloque = bloque[-self.capacidad:]
+
+            n = len(bloque)
+            i = self.escritas % self.capacidad
+            primera = min(n, self.capacidad - i)
+            self.datos[i:i + primera] = bloque[:primera]
+            self.datos[:n - primera] = bloque[primera:]
+            self.escritas += n
+
+            if self.pendientes > self.capacidad:
+                self.perdidas += self.pendientes - self.capacidad
+                self.leidas = self.escritas - self.capacidad
+            self._cond.notify_all()
+
+    def _copiar(self, desde, n):
+        i = desde % self.capacidad
+        primera = min(n, self.capacidad - i)
+        return np.concatenate((self.datos[i:i + primera], self.datos[:n - primera]))
+
+    def leer(self, n, minimo=1, timeout=0.5):
+        # Consume hasta n muestras pendientes, esperando a que haya al menos 'minimo'
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.pendientes >= minimo, timeout):
+                return self.datos[:0].copy()
+            n = min(n, self.pendientes)
+            salida = self._copiar(self.leidas, n)
+            self.leidas += n
+            return salida
+
+    def leer_desde(self, posicion, n, minimo=1, timeout=0.5):
+        # Lector adicional con cursor propio: no consume las muestras del
+        # escritor. Si el cursor quedó más atrás que la capacidad, salta a lo
+        # más antiguo disponible. Devuelve (muestras, nueva posición, saltadas)
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.escritas - posicion >= minimo, timeout):
+                return self.datos[:0].copy(), posicion, 0
+            saltadas = max(0, self.escritas - self.capacidad - posicion)
+            posicion += saltadas
+            n = min(n, self.escritas - posicion)
+            return self._copiar(posicion, n), posicion + n, saltadas
+
+    def ultimos(self, n):
+        # Copia de las n muestras más recientes, sin consumirlas
+        with self._cond:
+            n = min(n, self.escritas, self.capacidad)
+            return self._copiar(self.escritas - n, n)
+
+class AdquisicionStream:
+    def __init__(self, nombre_archivo, num_muestras=None, lector=None, tam_bloque=MAX_TRANSFERENCIAS,
+                 capacidad=CAPACIDAD_BUFFER, tam_chunk=TAM_CHUNK, chunks_por_fsync=CHUNKS_POR_FSYNC):
+        # El modo continuo siempre escribe binario; el CSV se exporta al terminar
+        self.nombre_archivo = nombre_archivo
+        if es_binario(nombre_archivo):
+            self.path_bin = nombre_archivo
+        else:
+            self.path_bin = os.path.splitext(nombre_archivo)[0] + EXTENSION
+
+        self.num_muestras = num_muestras or None
+        self.lector = lector or LectorSpi()
+        self.tam_bloque = tam_bloque
+        self.tam_chunk = tam_chunk
+        self.chunks_por_fsync = chunks_por_fsync
+        self.buffer = BufferCircular(capacidad)
+
+        self.inicio = None
+        self.tasa = 0.0
+        self._detener = threading.Event()
+        self._fin_adquisicion = threading.Event()
+        self._hilos = []
+
+        # Media de los códigos calculada de forma incremental
+        self._suma = 0
+        self._guardadas = 0
+
+    @property
+    def activa(self):
+        return any(h.is_alive() for h in self._hilos)
+
+    @property
+    def ocupacion(self):
+        return self.buffer.ocupacion
+
+    def iniciar(self):
+        self._hilos = [threading.Thread(target=self._adquirir, daemon=True),
+                       threading.Thread(target=self._escribir, daemon=True)]
+        for hilo in self._hilos:
+            hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+
+    def esperar(self):
+        for hilo in self._hilos:
+            hilo.join()
+
+    def _adquirir(self):
+        limite = f"{self.num_muestras} muestras" if self.num_muestras else "sin límite"
+        print(f"Iniciando recolección continua ({limite}) en '{self.path_bin}'")
+        bloque = np.empty(self.tam_bloque, dtype=np.uint16)
+        try:
+            with self.lector:
+                self.inicio = time.time()
+                t0 = time.perf_counter()
+                while not self._detener.is_set():
+                    n = self.tam_bloque
+                    if self.num_muestras:
+                        n = min(n, self.num_muestras - self.buffer.escritas)
+                        if n <= 0:
+                            break
+                    with trazas.tramo("leer_bloque", "adquisicion"):
+                        self.buffer.escribir(self.lector.leer_bloque(n, bloque[:n]))
+                    self.tasa = self.buffer.escritas / (time.perf_counter() - t0)
+        except Exception as e:
+            print(f"Error durante la adquisición: {e}")
+        finally:
+            self._fin_adquisicion.set()
+
+    def _cabecera(self):
+        escala = VREF / (2 ** NUM_BITS - 1)
+        offset = self._suma / self._guardadas * escala if self._guardadas else OFFSET
+        return empaquetar_cabecera(self.tasa, VREF, offset, self.inicio or time.time(),
+                                   self._guardadas, NUM_BITS)
+
+    def _escribir(self):
+        chunks = 0
+        try:
+            with open(self.path_bin, "wb") as f:
+                f.write(self._cabecera())
+                while True:
+                    # Solo se escriben chunks completos salvo el resto final
+                    if self._fin_adquisicion.is_set():
+                        chunk = self.buffer.leer(self.tam_chunk, timeout=0)
+                        if len(chunk) == 0:
+                            break
+                    else:
+                        chunk = self.buffer.leer(self.tam_chunk, self.tam_chunk)
+                        if len(chunk) == 0:
+                            continue
+
+                    with trazas.tramo("escribir_chunk", "adquisicion", muestras=len(chunk)):
+                        f.write(chunk.astype("<i2").tobytes())
+                    self._suma += int(chunk.sum(dtype=np.int64))
+                    self._guardadas += len(chunk)
+                    chunks += 1
+
+                    if chunks % self.chunks_por_fsync == 0:
+                        self._sincronizar(f)
+
+                self._sincronizar(f)
+        except PermissionError:
+            print(f"ERROR DE PERMISOS: No se pudo escribir en '{self.path_bin}'")
+            self._detener.set()
+            return
+
+        # La adquisición falló antes del primer bloque (por ejemplo, no se
+        # pudo abrir el ADC): la cabecera quedaría sin Fs y el archivo no se
+        # podría leer ni exportar
+        if not self._guardadas:
+            os.remove(self.path_bin)
+            print("No se registraron muestras; no se guardó ningún archivo.")
+            return
+
+        escala = VREF / (2 ** NUM_BITS - 1)
+        media = (self._suma / self._guardadas * escala - OFFSET) if self._guardadas else 0.0
+        print(f"Recolección completada: {self._guardadas} muestras a {self.tasa:.2f} Hz.")
+        print(f"Media de los datos adquiridos (verificación de offset): {media:.4f}V")
+        if self.buffer.perdidas:
+            print(f"Aviso: se descartaron {self.buffer.perdidas} muestras por buffer lleno.")
+        print(f"Datos guardados en '{self.path_bin}'")
+        self._publicar(media + OFFSET)
+
+        if self.path_bin != self.nombre_archivo:
+            print(f"Datos exportados a '{exportar_csv(self.path_bin, self.nombre_archivo)}'")
+
+    def _publicar(self, offset):
+        # Para clasificar sin releer el archivo se publican las muestras más
+        # recientes que siguen en el buffer circular
+        if not self._guardadas or not self.tasa:
+            return
+        from core.cargar_senal import Senal
+        codigos = self.buffer.ultimos(self._guardadas)
+        voltios = codigos * (VREF / (2 ** NUM_BITS - 1)) - offset
+        tiempo = np.arange(len(codigos)) / self.tasa
+        sesion.publicar(sesion.ADQUISICION, Senal(tiempo, voltios, self.tasa, self.path_bin))
+
+    @trazas.trazar("adquisicion", "fsync")
+    def _sincronizar(self, f):
+        # Actualiza la cabecera para que el archivo sea válido aunque se corte la energía
+        f.seek(0)
+        f.write(self._cabecera())
+        f.seek(0, os.SEEK_END)
+        f.flush()
+        os.fsync(f.fileno())
+
+def adquirir_stream(num_muestras, nombre_archivo, lector=None):
+    stream = AdquisicionStream(nombre_archivo, num_muestras, lector).iniciar()
+    stream.esperar()
+    return stream
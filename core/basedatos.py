@@ -0,0 +1,283 @@
+import sqlite3, os, sys, threading, queue
+from concurrent.futures import Future
+
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "usuarios.db")
+
+# Migraciones del esquema, en orden. PRAGMA user_version guarda cuántas se
+# aplicaron; cada una corre en su propia transacción.
+def _v1_esquema_inicial(conn):
+    # Igual al esquema que creaba la pestaña de registro
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS registro (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nit TEXT UNIQUE,
+            nombre TEXT,
+            apellido TEXT,
+            edad INTEGER,
+            correo TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS señales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nit TEXT,
+            archivo TEXT,
+            FOREIGN KEY (nit) REFERENCES registro(nit)
+        )
+    """)
+
+def _v2_nit_texto(conn):
+    # Versiones anteriores creaban registro.nit como INTEGER mientras que
+    # señales.nit es TEXT: se reconstruye la tabla con el NIT como texto
+    conn.execute("""
+        CREATE TABLE registro_v2 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nit TEXT NOT NULL UNIQUE,
+            nombre TEXT,
+            apellido TEXT,
+            edad INTEGER,
+            correo TEXT
+        )
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO registro_v2 (id, nit, nombre, apellido, edad, correo)
+        SELECT id, TRIM(CAST(nit AS TEXT)), nombre, apellido, edad, correo
+        FROM registro WHERE nit IS NOT NULL ORDER BY id
+    """)
+    conn.execute("DROP TABLE registro")
+    conn.execute("ALTER TABLE registro_v2 RENAME TO registro")
+    conn.execute("UPDATE señales SET nit = TRIM(CAST(nit AS TEXT))")
+
+def _v3_indices(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_senales_nit ON señales(nit)")
+
+def _v4_metadatos(conn):
+    # Resumen de cada señal calculado una vez al registrarla
+    for columna, tipo in (("duracion", "REAL"), ("fs", "REAL"), ("num_muestras", "INTEGER"),
+                          ("v_min", "REAL"), ("v_max", "REAL"), ("rms", "REAL"),
+                          ("f_dominante", "REAL")):
+        conn.execute(f"ALTER TABLE señales ADD COLUMN {columna} {tipo}")
+
+# Resultados por página en la búsqueda de pacientes
+TAM_PAGINA = 50
+
+# Columnas de resumen de señales (las claves que devuelve core.metadatos)
+CAMPOS_SENAL = ("duracion", "fs", "num_muestras", "v_min", "v_max", "rms", "f_dominante")
+
+def _valores(datos):
+    datos = datos or {}
+    return tuple(datos.get(c) for c in CAMPOS_SENAL)
+
+def _v5_busqueda(conn):
+    # Índices NOCASE para búsquedas por prefijo con LIKE (respaldo sin FTS5)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_registro_nit_nocase ON registro(nit COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_registro_nombre ON registro(nombre COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_registro_apellido ON registro(apellido COLLATE NOCASE)")
+
+    # Índice de texto completo sincronizado con registro mediante triggers
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE registro_fts USING fts5(
+                nit, nombre, apellido, content='registro', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError:
+        # SQLite compilado sin FTS5: la búsqueda usa LIKE
+        return
+    for sentencia in (
+        """CREATE TRIGGER registro_fts_ai AFTER INSERT ON registro BEGIN
+            INSERT INTO registro_fts(rowid, nit, nombre, apellido)
+            VALUES (new.id, new.nit, new.nombre, new.apellido);
+        END""",
+        """CREATE TRIGGER registro_fts_ad AFTER DELETE ON registro BEGIN
+            INSERT INTO registro_fts(registro_fts, rowid, nit, nombre, apellido)
+            VALUES ('delete', old.id, old.nit, old.nombre, old.apellido);
+        END""",
+        """CREATE TRIGGER registro_fts_au AFTER UPDATE ON registro BEGIN
+            INSERT INTO registro_fts(registro_fts, rowid, nit, nombre, apellido)
+            VALUES ('delete', old.id, old.nit, old.nombre, old.apellido);
+            INSERT INTO registro_fts(rowid, nit, nombre, apellido)
+            VALUES (new.id, new.nit, new.nombre, new.apellido);
+        END""",
+        "INSERT INTO registro_fts(registro_fts) VALUES ('rebuild')",
+    ):
+        conn.execute(sentencia)
+
+def _v6_metadatos_fallidos(conn):
+    # Señales cuyo resumen no se pudo calcular: no se reintenta en cada consulta
+    conn.execute("ALTER TABLE señales ADD COLUMN sin_metadatos INTEGER NOT NULL DEFAULT 0")
+
+MIGRACIONES = [_v1_esquema_inicial, _v2_nit_texto, _v3_indices, _v4_metadatos, _v5_busqueda,
+               _v6_metadatos_fallidos]
+
+def migrar(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for numero, migracion in enumerate(MIGRACIONES[version:], version + 1):
+        # BEGIN explícito: sqlite3 no abre transacciones para sentencias DDL
+        conn.execute("BEGIN")
+        try:
+            migracion(conn)
+            conn.execute(f"PRAGMA user_version = {numero}")
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+    return len(MIGRACIONES)
+
+class BaseDatos:
+    # Una sola conexión, dueña de un hilo dedicado: las consultas se encolan
+    # y se ejecutan en orden, fuera del hilo de Tk
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._cola = queue.Queue()
+        self._listo = threading.Event()
+        self._error = None
+        self.fts = False
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+        self._listo.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _conectar(self):
+        conn = sqlite3.connect(self.path)
+        # WAL: las lecturas no esperan a las escrituras y cada commit es más barato
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.row_factory = sqlite3.Row
+        migrar(conn)
+        # Después de migrar: reconstruir registro con claves foráneas activas fallaría
+        conn.execute("PRAGMA foreign_keys = ON")
+        self.fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'registro_fts'").fetchone() is not None
+        return conn
+
+    def _bucle(self):
+        try:
+            conn = self._conectar()
+        except Exception as e:
+            self._error = e
+            self._listo.set()
+            return
+        self._listo.set()
+
+        while True:
+            tarea = self._cola.get()
+            if tarea is None:
+                break
+            funcion, futuro = tarea
+            if not futuro.set_running_or_notify_cancel():
+                continue
+            try:
+                # Cada tarea es una transacción: commit al terminar, rollback si falla
+                with conn:
+                    resultado = funcion(conn)
+            except Exception as e:
+                futuro.set_exception(e)
+            else:
+                futuro.set_result(resultado)
+        conn.close()
+
+    def enviar(self, funcion):
+        # funcion(conn) se ejecuta en el hilo de la base de datos
+        futuro = Future()
+        self._cola.put((funcion, futuro))
+        return futuro
+
+    def ejecutar(self, funcion):
+        return self.enviar(funcion).result()
+
+    def cerrar(self):
+        self._cola.put(None)
+        self._hilo.join()
+
+    # Consultas de la pestaña de registro
+    def guardar_usuario(self, nit, nombre, apellido, edad, correo, archivos, metadatos=None):
+        # metadatos: un dict por archivo (ver core.metadatos) o None si no se calculó
+        nit = str(nit).strip()
+        metadatos = metadatos or [None] * len(archivos)
+
+        def guardar(conn):
+            nuevo = conn.execute(
+                "INSERT OR IGNORE INTO registro (nit, nombre, apellido, edad, correo) VALUES (?, ?, ?, ?, ?)",
+                (nit, nombre, apellido, edad, correo)).rowcount
+            conn.executemany(
+                f"INSERT INTO señales (nit, archivo, {', '.join(CAMPOS_SENAL)}) "
+                f"VALUES (?, ?{', ?' * len(CAMPOS_SENAL)})",
+                [(nit, archivo) + _valores(datos) for archivo, datos in zip(archivos, metadatos)])
+            return bool(nuevo)
+        return self.ejecutar(guardar)
+
+    def buscar_usuario(self, nit):
+        fila = self.ejecutar(lambda conn: conn.execute(
+            "SELECT nit, nombre, apellido, edad, correo FROM registro WHERE nit = ?",
+            (str(nit).strip(),)).fetchone())
+        return dict(fila) if fila else None
+
+    def buscar_pacientes(self, texto, pagina=0, tam_pagina=TAM_PAGINA):
+        # Cada palabra debe ser prefijo del NIT, el nombre o el apellido.
+        # Devuelve (filas de la página, hay más páginas)
+        palabras = texto.split()
+        columnas = "r.nit, r.nombre, r.apellido, r.edad, r.correo"
+        orden = "ORDER BY r.apellido COLLATE NOCASE, r.nombre COLLATE NOCASE, r.id LIMIT ? OFFSET ?"
+        limites = (tam_pagina + 1, pagina * tam_pagina)
+
+        if not palabras:
+            sql, args = f"SELECT {columnas} FROM registro r {orden}", limites
+        elif self.fts:
+            # "palabra"* : consulta de prefijo de FTS5 con la palabra escapada
+            consulta = " ".join('"' + p.replace('"', '""') + '"*' for p in palabras)
+            sql = (f"SELECT {columnas} FROM registro_fts f JOIN registro r ON r.id = f.rowid "
+                   f"WHERE registro_fts MATCH ? {orden}")
+            args = (consulta,) + limites
+        else:
+            # LIKE 'x%' aprovecha los índices NOCASE; se escapan los comodines
+            condicion = "(r.nit LIKE ? ESCAPE '\\' OR r.nombre LIKE ? ESCAPE '\\' OR r.apellido LIKE ? ESCAPE '\\')"
+            sql = (f"SELECT {columnas} FROM registro r WHERE "
+                   + " AND ".join([condicion] * len(palabras)) + f" {orden}")
+            args = []
+            for p in palabras:
+                patron = p.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                args += [patron] * 3
+            args = tuple(args) + limites
+
+        filas = self.ejecutar(lambda conn: conn.execute(sql, args).fetchall())
+        return [dict(f) for f in filas[:tam_pagina]], len(filas) > tam_pagina
+
+    def senales(self, nit):
+        filas = self.ejecutar(lambda conn: conn.execute(
+            "SELECT archivo FROM señales WHERE nit = ? ORDER BY id", (str(nit).strip(),)).fetchall())
+        return [f["archivo"] for f in filas]
+
+    def senales_detalle(self, nit):
+        filas = self.ejecutar(lambda conn: conn.execute(
+            f"SELECT id, archivo, {', '.join(CAMPOS_SENAL)}, sin_metadatos FROM señales "
+            "WHERE nit = ? ORDER BY id",
+            (str(nit).strip(),)).fetchall())
+        return [dict(f) for f in filas]
+
+    def actualizar_metadatos(self, pares):
+        # pares: [(id de la señal, dict de metadatos o None si el cálculo falló)]
+        asignaciones = ", ".join(f"{c} = ?" for c in CAMPOS_SENAL)
+        self.ejecutar(lambda conn: conn.executemany(
+            f"UPDATE señales SET {asignaciones}, sin_metadatos = ? WHERE id = ?",
+            [_valores(datos) + (datos is None, id_senal) for id_senal, datos in pares]))
+
+_instancia = {"bd": None}
+_lock = threading.Lock()
+
+def obtener_bd(path=DB_PATH):
+    # Instancia compartida por toda la aplicación
+    with _lock:
+        if _instancia["bd"] is None:
+            _instancia["bd"] = BaseDatos(path)
+        return _instancia["bd"]
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    bd = BaseDatos(path)
+    version = bd.ejecutar(lambda conn: conn.execute("PRAGMA user_version").fetchone()[0])
+    print(f"Base de datos '{path}' en la versión de esquema {version}")
+    bd.cerrar()
@@ -1,21 +1,22 @@
-import pandas as pd
 import customtkinter as ctk
 import matplotlib.pyplot as plt
 import sys, os
+from core.cargar_senal import cargar_senal
+from core.decimacion import graficar_decimado
+from utils import trazas
 
 def plot_g1(path):
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"No se encontró el archivo '{path}'")
-
-    # Cargar los datos desde el archivo CSV
-    df = pd.read_csv(path)
+    # Cargar los datos (CSV o binario) desde la caché compartida
+    return figura_g1(cargar_senal(path))
 
+@trazas.trazar("figura")
+def figura_g1(senal):
     # Crear figura
     fig, ax = plt.subplots(figsize=(4,2))
-    ax.plot(df['tiempo'], df['voltios'],
-            label='Voltaje MCP3202',
-            color='r',
-            linewidth=0.5)
+    graficar_decimado(ax, senal.tiempo, senal.voltios,
+                      label='Voltaje MCP3202',
+                      color='r',
+                      linewidth=0.5)
     ax.set_title('Lecturas DAQ')
     ax.set_xlabel('Tiempo (s)')
     ax.set_ylabel('Voltios')
@@ -29,7 +30,7 @@ def plot_g1(path):
 if __name__ == "__main__":
     #import sys
     if len(sys.argv) < 2:
-        print("Uso: python cargar_graficar_csv.py archivo.csv")
+        print("Uso: python -m core.cargar_graficar_csv archivo.csv")
     else:
         fig = plot_g1(sys.argv[1])
         plt.show()
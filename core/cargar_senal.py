@@ -0,0 +1,63 @@
+import os, threading
+import numpy as np
+from collections import OrderedDict, namedtuple
+from core.formato_bin import leer_senal
+from core.espectro import estimar_fs
+from utils import trazas
+
+# Señal cargada en memoria: los arreglos se comparten entre módulos,
+# por lo que no deben modificarse en sitio
+Senal = namedtuple("Senal", ["tiempo", "voltios", "fs", "path"])
+
+# Límite de memoria de la caché (bytes de los arreglos guardados)
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_bytes = {"total": 0}
+_lock = threading.Lock()
+
+def _tam(senal):
+    return senal.tiempo.nbytes + senal.voltios.nbytes
+
+def _quitar(clave):
+    senal = _cache.pop(clave)
+    _cache_bytes["total"] -= _tam(senal)
+
+def cargar_senal(path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No se encontró el archivo '{path}'")
+
+    # La clave incluye mtime y tamaño: si el archivo cambia, se vuelve a leer
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    clave = (path, st.st_mtime_ns, st.st_size)
+
+    with _lock:
+        if clave in _cache:
+            _cache.move_to_end(clave)
+            return _cache[clave]
+
+    with trazas.tramo("leer_senal", "carga", archivo=os.path.basename(path)):
+        tiempo, voltios = leer_senal(path)
+    # Pandas puede devolver vistas de solo lectura, que pywt no acepta
+    tiempo = np.require(tiempo, np.float64, ["C_CONTIGUOUS", "WRITEABLE"])
+    voltios = np.require(voltios, np.float64, ["C_CONTIGUOUS", "WRITEABLE"])
+    fs = estimar_fs(tiempo) if len(tiempo) > 1 else 0.0
+    senal = Senal(tiempo, voltios, fs, path)
+
+    with _lock:
+        # Descartar versiones anteriores del mismo archivo
+        for vieja in [c for c in _cache if c[0] == path]:
+            _quitar(vieja)
+
+        _cache[clave] = senal
+        _cache_bytes["total"] += _tam(senal)
+        while _cache_bytes["total"] > CACHE_MAX_BYTES and len(_cache) > 1:
+            _quitar(next(iter(_cache)))
+
+    return senal
+
+def limpiar_cache():
+    with _lock:
+        _cache.clear()
+        _cache_bytes["total"] = 0
@@ -0,0 +1,166 @@
+import time, threading
+import numpy as np
+from scipy.fft import rfft, dct
+from scipy.signal import get_window
+from core.adquirircsv import VREF, NUM_BITS
+from core.csv_to_wav import ESCALA_PCM
+from core.predict import obtener_modelo, ETIQUETAS
+from utils import trazas
+
+# Parámetros de librosa.feature.mfcc por defecto, los mismos del entrenamiento
+N_FFT = 2048
+HOP = 512
+N_MELS = 128
+N_MFCC = 13
+AMIN_DB = -100.0    # 10 * log10(amin = 1e-10)
+TOP_DB = 80.0
+
+# Ventana deslizante clasificada y cada cuánto se evalúa
+VENTANA_S = 5.0
+PERIODO_S = 0.5
+# Tiempo de adquisición antes de fijar Fs (la tasa medida al inicio varía)
+CALENTAMIENTO_S = 1.0
+# Suavizado exponencial de la probabilidad mostrada
+ALFA = 0.3
+
+class MfccIncremental:
+    # MFCC por ventana deslizante: cada trama se transforma una sola vez y su
+    # espectro mel en dB se guarda en un anillo de tramas. Evaluar la ventana
+    # solo aplica la normalización de amplitud, el recorte top_db, la media y
+    # la DCT sobre las tramas guardadas.
+    def __init__(self, fs, ventana_s=VENTANA_S, n_mfcc=N_MFCC):
+        import librosa
+        self.fs = fs
+        self.n_mfcc = n_mfcc
+        self.mel = librosa.filters.mel(sr=fs, n_fft=N_FFT, n_mels=N_MELS).T.astype(np.float32)
+        self.hann = get_window("hann", N_FFT).astype(np.float32)
+
+        self.capacidad = max(int(ventana_s * fs / HOP), 1)
+        self.db = np.zeros((self.capacidad, N_MELS), dtype=np.float32)
+        self.picos = np.zeros(self.capacidad, dtype=np.float32)
+        self.tramas = 0
+        self._resto = np.zeros(0, dtype=np.float32)
+
+    @property
+    def llena(self):
+        return self.tramas >= self.capacidad
+
+    def reiniciar_resto(self):
+        # Tras un salto en los datos no se enlazan tramas discontinuas
+        self._resto = self._resto[:0]
+
+    def agregar(self, muestras):
+        x = np.concatenate((self._resto, np.asarray(muestras, dtype=np.float32)))
+        if len(x) < N_FFT:
+            self._resto = x
+            return 0
+
+        n = 1 + (len(x) - N_FFT) // HOP
+        tramas = np.lib.stride_tricks.sliding_window_view(x, N_FFT)[::HOP][:n]
+        potencia = np.abs(rfft(tramas * self.hann, axis=1)) ** 2
+        db = 10 * np.log10(np.maximum(potencia @ self.mel, 1e-30))
+        picos = np.abs(tramas).max(axis=1)
+        self._resto = x[n * HOP:]
+
+        # Se guardan en el anillo; si llegan más tramas que la capacidad, las últimas
+        db, picos = db[-self.capacidad:], picos[-self.capacidad:]
+        idx = (self.tramas + np.arange(len(db))) % self.capacidad
+        self.db[idx] = db
+        self.picos[idx] = picos
+        self.tramas += n
+        return n
+
+    def caracteristicas(self):
+        n = min(self.tramas, self.capacidad)
+        db, pico = self.db[:n], self.picos[:n].max()
+        if pico == 0:
+            return None
+        # Misma normalización que a_pcm16 + librosa.load: pico en ESCALA_PCM/32768
+        db = np.maximum(db + 20 * np.log10(ESCALA_PCM / 32768 / pico), AMIN_DB)
+        db = np.maximum(db, db.max() - TOP_DB)
+        # La DCT es lineal: la media de los MFCC es la DCT de la media
+        return dct(db.mean(axis=0), type=2, norm="ortho")[:self.n_mfcc]
+
+class ClasificadorStream:
+    def __init__(self, stream, ventana_s=VENTANA_S, periodo_s=PERIODO_S):
+        self.stream = stream
+        self.ventana_s = ventana_s
+        self.periodo_s = periodo_s
+        # Estado leído por la interfaz (se reemplaza el dict completo)
+        self.ultimo = {"prob_copd": None, "etiqueta": None, "ventanas": 0,
+                       "retraso_s": 0.0, "saltadas": 0}
+        self._detener = threading.Event()
+        self._hilo = None
+
+    @property
+    def activo(self):
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._ejecutar, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+
+    def _ejecutar(self):
+        try:
+            self._clasificar()
+        except Exception as e:
+            print(f"Error en la clasificación en vivo: {e}")
+
+    def _clasificar(self):
+        buffer = self.stream.buffer
+        modelo = obtener_modelo()
+
+        # Se espera a que la tasa medida sea estable para fijar los filtros mel
+        while self.stream.activa and not self._detener.is_set():
+            if self.stream.tasa > 0 and buffer.escritas >= CALENTAMIENTO_S * self.stream.tasa:
+                break
+            time.sleep(0.1)
+        else:
+            return
+
+        fs = self.stream.tasa
+        mfcc = MfccIncremental(fs, self.ventana_s)
+        escala = VREF / (2 ** NUM_BITS - 1)
+        posicion = buffer.escritas
+        suma, cuenta, saltadas = 0, 0, 0
+        prob, ventanas = None, 0
+        siguiente = mfcc.tramas + max(int(self.periodo_s * fs / HOP), 1)
+
+        # Solo lee del buffer con su propio cursor: nunca bloquea a la
+        # adquisición ni al escritor; si se atrasa, salta muestras (no las pierde el archivo)
+        while not self._detener.is_set():
+            codigos, posicion, salto = buffer.leer_desde(posicion, int(fs), HOP)
+            if len(codigos) == 0:
+                if not self.stream.activa:
+                    break
+                continue
+            if salto:
+                saltadas += salto
+                mfcc.reiniciar_resto()
+
+            # Media de los códigos acumulada, como la corrección de offset del archivo
+            suma += int(codigos.sum(dtype=np.int64))
+            cuenta += len(codigos)
+            with trazas.tramo("mfcc_incremental", "caracteristicas", muestras=len(codigos)):
+                mfcc.agregar((codigos - suma / cuenta) * escala)
+
+            if not mfcc.llena or mfcc.tramas < siguiente:
+                continue
+            siguiente = mfcc.tramas + max(int(self.periodo_s * fs / HOP), 1)
+
+            with trazas.tramo("clasificar_ventana", "prediccion"):
+                feat = mfcc.caracteristicas()
+                if feat is None:
+                    continue
+                puntaje = modelo.decision_function(feat.reshape(1, -1))[0]
+            # Probabilidad de COPD a partir del margen (sin calibrar), suavizada
+            p = float(1.0 / (1.0 + np.exp(-puntaje)))
+            prob = p if prob is None else ALFA * p + (1 - ALFA) * prob
+            ventanas += 1
+            self.ultimo = {"prob_copd": prob, "etiqueta": ETIQUETAS[int(prob >= 0.5)],
+                           "ventanas": ventanas, "retraso_s": (buffer.escritas - posicion) / fs,
+                           "saltadas": saltadas}
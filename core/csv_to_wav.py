@@ -1,39 +1,42 @@
-import pandas as pd
 import numpy as np
 from scipy.io.wavfile import write
 import sys, subprocess, os
+from core.remuestreo import senal_uniforme
 
-COLUMNA_VOLTAJE = 'voltios'
+# Tasa usada solo si la señal no tiene una Fs válida
 SAMPLE_RATE_AUDIO = 6800
+# Pico de la señal normalizada, en cuentas int16, para las características del
+# clasificador (predict y clasificador_stream): cambiarlo desplaza los MFCC.
+# Los WAV exportados usan ESCALA_AUDIO, así que clasificarlos con
+# predict_audio no da las mismas características que predict_senal
+ESCALA_PCM = 4096
+# Pico de los WAV exportados para escuchar: todo el rango int16
+ESCALA_AUDIO = 32767
 
-def csv_to_wav(path_csv, sample_rate=SAMPLE_RATE_AUDIO):
-    if not os.path.exists(path_csv):
-        raise FileNotFoundError(f"No se encontró el archivo '{path_csv}'")
+def a_pcm16(voltajes, escala=ESCALA_PCM):
+    # Normalizar al rango int16
+    max_abs_val = np.max(np.abs(voltajes))
+    if max_abs_val == 0:
+        raise ValueError("La señal es plana (voltaje constante), no se puede generar audio.")
+
+    escala_audio = escala / max_abs_val
+    return (voltajes * escala_audio).astype(np.int16)
 
+def csv_to_wav(path_csv, sample_rate=None):
     # Generar nombre del archivo WAV en la misma ruta
     base, _ = os.path.splitext(path_csv)
     path_wav = base + ".wav"
 
-    # Cargar datos
-    df = pd.read_csv(path_csv)
-    if COLUMNA_VOLTAJE not in df.columns:
-        raise ValueError(f"No se encontró la columna '{COLUMNA_VOLTAJE}' en el archivo CSV.")
-
-    voltajes = df[COLUMNA_VOLTAJE].values
+    # Cargar datos (CSV o binario) en rejilla uniforme, a sample_rate si se indica
+    senal = senal_uniforme(path_csv, sample_rate)
+    voltajes = senal.voltios
     N = len(voltajes)
     if N == 0:
-        raise ValueError("El archivo CSV no contiene datos en la columna de voltaje.")
-
-    # Normalizar al rango int16
-    max_abs_val = np.max(np.abs(voltajes))
-    if max_abs_val == 0:
-        raise ValueError("La señal es plana (voltaje constante), no se puede generar audio.")
-
-    escala_audio = 4096/ max_abs_val
-    audio_data = (voltajes * escala_audio).astype(np.int16)
+        raise ValueError("El archivo no contiene datos de voltaje.")
 
-    # Guardar WAV
-    write(path_wav, sample_rate, audio_data)
+    # Guardar WAV a la Fs real de la señal (el encabezado WAV la guarda entera)
+    sample_rate = int(round(senal.fs)) if senal.fs > 0 else SAMPLE_RATE_AUDIO
+    write(path_wav, sample_rate, a_pcm16(voltajes, ESCALA_AUDIO))
 
     return path_wav
 
@@ -53,7 +56,7 @@ def play_wav(path_wav):
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Uso: python csv_to_wav.py archivo.csv")
+        print("Uso: python -m core.csv_to_wav archivo.csv")
     else:
         path_csv = sys.argv[1]
         wav_file = csv_to_wav(path_csv)
@@ -0,0 +1,57 @@
+import numpy as np
+
+# Columnas mínimas al decimar, por si el eje aún no tiene tamaño real
+MIN_COLUMNAS = 200
+# Muestras procesadas por grupo de columnas: argmin/argmax copian su entrada,
+# así que sobre un memmap se recorre por grupos para no copiar el registro entero
+MUESTRAS_POR_GRUPO = 1 << 22
+
+def indices_minmax(y, num_columnas):
+    # Índices del mínimo y máximo de cada columna, en orden temporal, más los
+    # extremos para conservar el rango completo del eje x
+    n = len(y)
+    if n <= 2 * num_columnas:
+        return np.arange(n)
+
+    paso = n // num_columnas
+    m = paso * num_columnas
+    bloques = y[:m].reshape(num_columnas, paso)
+    minimos = np.empty(num_columnas, dtype=np.intp)
+    maximos = np.empty(num_columnas, dtype=np.intp)
+    filas = max(MUESTRAS_POR_GRUPO // paso, 1)
+    for f0 in range(0, num_columnas, filas):
+        grupo = np.asarray(bloques[f0:f0 + filas])
+        minimos[f0:f0 + filas] = grupo.argmin(axis=1)
+        maximos[f0:f0 + filas] = grupo.argmax(axis=1)
+    base = np.arange(num_columnas) * paso
+    pares = np.sort(np.column_stack((base + minimos, base + maximos)), axis=1).ravel()
+
+    resto = y[m:]
+    if len(resto):
+        pares = np.concatenate((pares, np.sort([m + np.argmin(resto), m + np.argmax(resto)])))
+    return np.unique(np.concatenate(([0], pares, [n - 1])))
+
+def envolvente_minmax(x, y, num_columnas):
+    idx = indices_minmax(y, num_columnas)
+    return x[idx], y[idx]
+
+def _columnas(ax):
+    return max(int(ax.bbox.width), MIN_COLUMNAS)
+
+def graficar_decimado(ax, x, y, **kwargs):
+    # Dibuja solo la envolvente mín/máx por píxel y la recalcula para el rango
+    # visible cada vez que cambian los límites (zoom o desplazamiento)
+    x = np.asarray(x)
+    y = np.asarray(y)
+    linea, = ax.plot(*envolvente_minmax(x, y, _columnas(ax)), **kwargs)
+
+    def actualizar(ax):
+        x0, x1 = ax.get_xlim()
+        i0 = max(np.searchsorted(x, x0) - 1, 0)
+        i1 = min(np.searchsorted(x, x1) + 1, len(x))
+        if i1 - i0 < 2:
+            return
+        linea.set_data(*envolvente_minmax(x[i0:i1], y[i0:i1], _columnas(ax)))
+
+    ax.callbacks.connect('xlim_changed', actualizar)
+    return linea
@@ -1,38 +1,126 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import pywt, sys, os
+import pywt, sys, os, threading
+from collections import OrderedDict
+from core.remuestreo import senal_uniforme
+from core.decimacion import graficar_decimado
+from utils import trazas
 
-def plot_wavelet(path, wavelet='db6', nivel=1):
+# Profundidad máxima de la descomposición (se limita además por la longitud)
+NIVEL_MAX = 8
+# Descomposiciones guardadas (una por archivo y wavelet)
+CACHE_MAX = 8
 
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"No se encontró el archivo '{path}'")
+_cache = OrderedDict()
+_lock = threading.Lock()
 
-    # Cargar datos CSV
-    df = pd.read_csv(path)
-    tiempo = df['tiempo'].values
-    voltaje = df['voltios'].values
-    num_datos = len(voltaje)
+class DescomposicionWavelet:
+    def __init__(self, coefs, wavelet, num_muestras):
+        # coefs = [cA_L, cD_L, ..., cD_1], como los devuelve pywt.wavedec
+        self.coefs = coefs
+        self.wavelet = wavelet
+        self.num_muestras = num_muestras
+        self.niveles = len(coefs) - 1
+        self._bandas = {}
+        self._sin_ruido = None
 
-    # Aplicamos la DWT 
-    cA, cD = pywt.dwt(voltaje, wavelet, mode='symmetric')
+    @classmethod
+    def calcular(cls, voltios, wavelet='db6', nivel_max=NIVEL_MAX):
+        niveles = min(nivel_max, pywt.dwt_max_level(len(voltios), pywt.Wavelet(wavelet).dec_len))
+        coefs = pywt.wavedec(voltios, wavelet, mode='symmetric', level=max(niveles, 1))
+        return cls(coefs, wavelet, len(voltios))
+
+    def _indice(self, nombre):
+        # 'A' -> aproximación más profunda, 'Dk' -> detalle del nivel k
+        if nombre == 'A':
+            return 0
+        return self.niveles - int(nombre[1:]) + 1
+
+    def banda(self, nombre):
+        # Reconstrucción de una sola banda, calculada una vez bajo demanda
+        if nombre not in self._bandas:
+            i = self._indice(nombre)
+            solo = [c if j == i else np.zeros_like(c) for j, c in enumerate(self.coefs)]
+            self._bandas[nombre] = pywt.waverec(solo, self.wavelet, mode='symmetric')[:self.num_muestras]
+        return self._bandas[nombre]
+
+    def detalle(self, nivel):
+        return self.banda(f'D{min(max(nivel, 1), self.niveles)}')
+
+    def aproximacion(self, nivel):
+        # A_nivel = A_L + D_L + ... + D_(nivel+1), sin repetir la transformada
+        nivel = min(max(nivel, 1), self.niveles)
+        aprox = self.banda('A').copy()
+        for k in range(nivel + 1, self.niveles + 1):
+            aprox += self.banda(f'D{k}')
+        return aprox
+
+    def sin_ruido(self, modo='soft'):
+        # Umbral universal de Donoho: sigma estimada con la mediana de D1
+        if self._sin_ruido is None:
+            sigma = np.median(np.abs(self.coefs[-1])) / 0.6745
+            umbral = sigma * np.sqrt(2 * np.log(self.num_muestras))
+            coefs = [self.coefs[0]] + [pywt.threshold(c, umbral, mode=modo) for c in self.coefs[1:]]
+            self._sin_ruido = DescomposicionWavelet(coefs, self.wavelet, self.num_muestras)
+        return self._sin_ruido
+
+    def reconstruir(self):
+        return pywt.waverec(self.coefs, self.wavelet, mode='symmetric')[:self.num_muestras]
+
+def descomposicion(path, wavelet='db6'):
+    senal = senal_uniforme(path)
+    st = os.stat(senal.path)
+    clave = (senal.path, st.st_mtime_ns, st.st_size, wavelet)
+
+    with _lock:
+        if clave in _cache:
+            _cache.move_to_end(clave)
+            return _cache[clave]
+
+    with trazas.tramo("wavedec", "dsp", wavelet=wavelet, muestras=len(senal.voltios)):
+        desc = DescomposicionWavelet.calcular(senal.voltios, wavelet)
+
+    with _lock:
+        _cache[clave] = desc
+        while len(_cache) > CACHE_MAX:
+            _cache.popitem(last=False)
+    return desc
+
+@trazas.trazar("dsp")
+def calcular_wavelet(path, wavelet='db6', nivel=1, banda=None, sin_ruido=False):
+    tiempo = senal_uniforme(path).tiempo
+    desc = descomposicion(path, wavelet)
+    if sin_ruido:
+        desc = desc.sin_ruido()
+
+    nivel = min(max(nivel, 1), desc.niveles)
+    banda = min(max(banda or nivel, 1), desc.niveles)
 
     # Reconstrucción de la señal en sus dos componentes (detalle y aproximación)
-    A = pywt.idwt(cA, None, wavelet, mode='symmetric')[:N]
-    D = pywt.idwt(None, cD, wavelet, mode='symmetric')[:N]
+    return {"tiempo": tiempo, "A": desc.aproximacion(nivel), "D": desc.detalle(banda),
+            "nivel": nivel, "banda": banda, "wavelet": wavelet, "sin_ruido": sin_ruido}
+
+def plot_wavelet(path, wavelet='db6', nivel=1, banda=None, sin_ruido=False):
+    return figura_wavelet(calcular_wavelet(path, wavelet, nivel, banda, sin_ruido))
+
+@trazas.trazar("figura")
+def figura_wavelet(res):
+    tiempo, A, D = res["tiempo"], res["A"], res["D"]
+    nivel, banda, wavelet = res["nivel"], res["banda"], res["wavelet"]
+    sufijo = " (sin ruido)" if res["sin_ruido"] else ""
 
     # Figura de la DWT
     fig, axes = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
 
-    axes[0].plot(tiempo, A, color='green', linewidth=0.5,
-                 label=f'Aproximación (Baja Frecuencia) - {wavelet}')
-    axes[0].set_title('Componente de Aproximación')
+    graficar_decimado(axes[0], tiempo, A, color='green', linewidth=0.5,
+                      label=f'Aproximación A{nivel} (Baja Frecuencia) - {wavelet}')
+    axes[0].set_title('Componente de Aproximación' + sufijo)
     axes[0].set_ylabel('Voltaje (V)')
     axes[0].grid(True)
     axes[0].legend()
-    axes[1].plot(tiempo, D, color='red', linewidth=0.5,
-                 label=f'Detalle (Alta Frecuencia) - {wavelet}')
-    axes[1].set_title('Componente de Detalle ')
+    graficar_decimado(axes[1], tiempo, D, color='red', linewidth=0.5,
+                      label=f'Detalle D{banda} (Alta Frecuencia) - {wavelet}')
+    axes[1].set_title('Componente de Detalle ' + sufijo)
     axes[1].set_xlabel('Tiempo (s)')
     axes[1].set_ylabel('Voltaje (V)')
     axes[1].grid(True)
@@ -45,7 +133,8 @@ def plot_wavelet(path, wavelet='db6', nivel=1):
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Uso: python dwt_csv.py archivo.csv")
+        print("Uso: python -m core.dwt_csv archivo.csv [nivel]")
     else:
-        fig = plot_wavelet(sys.argv[1])
+        nivel = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        fig = plot_wavelet(sys.argv[1], nivel=nivel)
         plt.show()
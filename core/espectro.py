@@ -0,0 +1,54 @@
+import numpy as np
+from scipy.fft import rfft, rfftfreq, next_fast_len
+from scipy.signal import welch
+
+# A partir de este número de muestras el modo automático usa Welch
+UMBRAL_WELCH = 1 << 18
+# Longitud de segmento de Welch (resolución = fs / NPERSEG_WELCH)
+NPERSEG_WELCH = 4096
+
+def estadisticas_tiempo(tiempo):
+    # Estadísticas de los intervalos entre marcas de tiempo. Los huecos (pausas
+    # del sistema mayores a 1.5 veces el intervalo típico) no cuentan para Fs
+    if len(tiempo) < 2 or tiempo[-1] <= tiempo[0]:
+        raise ValueError("No hay suficientes datos para calcular Fs.")
+
+    dt = np.diff(tiempo)
+    mediana = np.median(dt)
+    normales = dt[(dt > 0.5 * mediana) & (dt < 1.5 * mediana)]
+    if len(normales) == 0:
+        normales = dt
+
+    # La media de los intervalos normales compensa la resolución limitada de
+    # las marcas guardadas en CSV
+    media = normales.mean()
+    return {
+        "fs": float(1.0 / media),
+        "jitter": float(normales.std()),
+        "huecos": int(np.count_nonzero(dt >= 1.5 * mediana)),
+    }
+
+def estimar_fs(tiempo):
+    return estadisticas_tiempo(tiempo)["fs"]
+
+def espectro_rfft(voltios, fs):
+    # FFT real con relleno a una longitud rápida; amplitud normalizada en Vp
+    n = len(voltios)
+    nfft = next_fast_len(n, real=True)
+    amplitud = np.abs(rfft(voltios, nfft)) * (2.0 / n)
+    amplitud[0] /= 2
+    return rfftfreq(nfft, 1 / fs), amplitud
+
+def espectro_welch(voltios, fs, nperseg=NPERSEG_WELCH):
+    # Promedio de segmentos con solape: más suave y barato en señales largas
+    f, P = welch(voltios, fs, window="hann", nperseg=min(nperseg, len(voltios)),
+                 scaling="spectrum")
+    # Espectro de potencia (V rms^2) a amplitud pico
+    return f, np.sqrt(2 * P)
+
+def espectro(voltios, fs, metodo="auto"):
+    if metodo == "auto":
+        metodo = "welch" if len(voltios) > UMBRAL_WELCH else "fft"
+    if metodo == "welch":
+        return espectro_welch(voltios, fs) + ("welch",)
+    return espectro_rfft(voltios, fs) + ("fft",)
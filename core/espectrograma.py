@@ -0,0 +1,91 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft, rfftfreq
+from scipy.signal import get_window
+import sys
+from core.remuestreo import senal_uniforme
+from core.formato_bin import es_binario, abrir_bin
+from utils import trazas
+
+# Parámetros de la STFT
+TAM_VENTANA = 1024
+SOLAPE = 0.5
+# Columnas máximas de la imagen (resolución de pantalla)
+MAX_COLUMNAS = 800
+# Ventanas procesadas por tramo: acota la memoria usada en cada paso
+VENTANAS_POR_TRAMO = 512
+
+def stft_por_tramos(leer_tramo, num_muestras, fs, nperseg=TAM_VENTANA, solape=SOLAPE,
+                    max_columnas=MAX_COLUMNAS):
+    # leer_tramo(i0, i1) devuelve las muestras [i0, i1) en voltios
+    hop = max(int(nperseg * (1 - solape)), 1)
+    if num_muestras < nperseg:
+        raise ValueError("La señal es más corta que la ventana de la STFT.")
+
+    num_ventanas = 1 + (num_muestras - nperseg) // hop
+    # Ventanas consecutivas que se promedian en una misma columna de la imagen
+    agrupar = -(-num_ventanas // max_columnas)
+    columnas = -(-num_ventanas // agrupar)
+    por_tramo = max(VENTANAS_POR_TRAMO // agrupar, 1) * agrupar
+
+    ventana = get_window("hann", nperseg)
+    escala = 1.0 / (fs * np.sum(ventana ** 2))
+    potencia = np.zeros((nperseg // 2 + 1, columnas))
+
+    for v0 in range(0, num_ventanas, por_tramo):
+        v1 = min(v0 + por_tramo, num_ventanas)
+        x = np.asarray(leer_tramo(v0 * hop, (v1 - 1) * hop + nperseg), dtype=np.float64)
+
+        tramas = sliding_window_view(x, nperseg)[::hop]
+        P = np.abs(rfft(tramas * ventana, axis=1)) ** 2 * escala
+
+        # Promedio por grupos (el último grupo puede quedar incompleto)
+        inicios = np.arange(0, len(P), agrupar)
+        cuentas = np.diff(np.append(inicios, len(P)))
+        c0 = v0 // agrupar
+        potencia[:, c0:c0 + len(inicios)] = (np.add.reduceat(P, inicios, axis=0) / cuentas[:, None]).T
+
+    # Densidad espectral de un solo lado
+    potencia[1:(nperseg + 1) // 2] *= 2
+
+    frecuencias = rfftfreq(nperseg, 1 / fs)
+    # Tiempo en el centro de cada columna
+    centros = (np.arange(columnas) * agrupar + (agrupar - 1) / 2) * hop + nperseg / 2
+    return frecuencias, centros / fs, potencia
+
+@trazas.trazar("dsp")
+def espectrograma(path, nperseg=TAM_VENTANA, solape=SOLAPE):
+    # Los registros binarios se leen por tramos desde el memmap, sin cargarlos completos
+    if es_binario(path):
+        reg = abrir_bin(path)
+        return stft_por_tramos(reg.voltios, len(reg), reg.fs, nperseg, solape)
+
+    senal = senal_uniforme(path)
+    return stft_por_tramos(lambda i0, i1: senal.voltios[i0:i1], len(senal.voltios), senal.fs,
+                           nperseg, solape)
+
+def plot_espectrograma(path):
+    return figura_espectrograma(*espectrograma(path))
+
+@trazas.trazar("figura")
+def figura_espectrograma(f, t, S):
+    # Figura del espectrograma
+    fig, ax = plt.subplots(figsize=(4,2))
+    paso_t = t[1] - t[0] if len(t) > 1 else 0
+    im = ax.imshow(10 * np.log10(S + 1e-20), origin='lower', aspect='auto', cmap='viridis',
+                   extent=[t[0] - paso_t / 2, t[-1] + paso_t / 2, f[0], f[-1]])
+    ax.set_title('Espectrograma (STFT)')
+    ax.set_xlabel('Tiempo (s)')
+    ax.set_ylabel('Frecuencia (Hz)')
+    fig.colorbar(im, ax=ax, label='dB/Hz')
+
+    return fig
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m core.espectrograma archivo.csv")
+    else:
+        fig = plot_espectrograma(sys.argv[1])
+        plt.show()
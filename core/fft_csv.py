@@ -1,51 +1,51 @@
-import pandas as pd
 import numpy as np
 import customtkinter as ctk
 import matplotlib.pyplot as plt
-from scipy.fft import fft, fftfreq
 import sys, os
+from core.remuestreo import senal_uniforme
+from core.espectro import espectro
+from utils import trazas
 
-def plot_fft(path):
-    if not os.path.exists(path):
-        print(f"Error: No se encontró el archivo '{path}'")
-        sys.exit(1)
+TITULOS = {"fft": 'Espectro de Frecuencia (FFT)', "welch": 'Espectro de Frecuencia (Welch)'}
 
-    # Cargar los datos desde el archivo CSV
-    df = pd.read_csv(path)
-    tiempo = df['tiempo'].values
-    voltaje = df['voltios'].values
+def calcular_fft(path, metodo="auto"):
+    # Cargar los datos (CSV o binario) ya en rejilla uniforme, desde la caché compartida
+    senal = senal_uniforme(path)
+    voltaje = senal.voltios
     num_datos = len(voltaje)
 
-    # Calcular la tasa de muestreo promedio (Fs)
-    if num_datos > 1:
-        duracion_total = tiempo[-1] - tiempo[0]
-        Fs = num_datos / duracion_total
-        print(f"Tasa de muestreo (Fs) aproximada: {Fs:.2f} Hz")
-    else:
-        print("Error: No hay suficientes datos para calcular Fs.")
-        sys.exit(1)
+    # Tasa de muestreo (Fs) estimada a partir de las marcas de tiempo
+    if num_datos < 2 or senal.fs <= 0:
+        raise ValueError("No hay suficientes datos para calcular Fs.")
+    Fs = senal.fs
+    print(f"Tasa de muestreo (Fs) aproximada: {Fs:.2f} Hz")
+
+    # Espectro: FFT real completa o Welch para registros largos
+    with trazas.tramo("espectro", "dsp", metodo=metodo, muestras=num_datos):
+        xf, amplitud, metodo = espectro(voltaje, Fs, metodo)
+    return xf, amplitud, metodo, Fs
 
-    # Aplicamos la FFT
-    yf = np.abs(fft(voltaje))
-    xf = fftfreq(num_datos, 1/Fs)
+def plot_fft(path, metodo="auto"):
+    return figura_fft(*calcular_fft(path, metodo))
 
+@trazas.trazar("figura")
+def figura_fft(xf, amplitud, metodo, Fs):
    # Figura de la FFT
     fig, ax = plt.subplots(figsize=(4,2))
-    ax.plot(xf[:num_datos//2], 2.0/num_datos * yf[:num_datos//2],
-            linewidth=0.5) 
-    ax.set_title('Espectro de Frecuencia (FFT)')
+    ax.plot(xf, amplitud, linewidth=0.5) 
+    ax.set_title(TITULOS[metodo])
     ax.set_xlabel('Frecuencia (Hz)')
     ax.set_ylabel('Amplitud Normalizada (Vp)')
     ax.grid(True)
-    ax.set_xlim(0, 1200)  # opcional
+    ax.set_xlim(0, Fs / 2)
 
     return fig
 
 # Bloque para ejecución independiente desde consola
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Uso: python fft_csv.py archivo.csv")
+        print("Uso: python -m core.fft_csv archivo.csv [auto|fft|welch]")
     else:
-        fig = plot_fft(sys.argv[1])
+        metodo = sys.argv[2] if len(sys.argv) > 2 else "auto"
+        fig = plot_fft(sys.argv[1], metodo)
         plt.show()
-
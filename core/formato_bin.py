@@ -0,0 +1,145 @@
+import numpy as np
+import struct, sys, os
+
+# Formato binario de registro (.ausc): cabecera fija de 64 bytes seguida de
+# los códigos crudos del ADC en int16 little-endian, uno por muestra.
+EXTENSION = ".ausc"
+MAGIA = b"AUSC"
+VERSION = 1
+TAM_CABECERA = 64
+
+# magia, versión, bits del ADC, fs, vref, offset, inicio (epoch), num. muestras
+_CABECERA = struct.Struct("<4sHHddddQ16x")
+
+COLUMNA_TIEMPO = 'tiempo'
+COLUMNA_VOLTAJE = 'voltios'
+
+# Tamaño de bloque para exportar sin cargar todo el registro en memoria
+MUESTRAS_POR_BLOQUE = 65536
+
+def es_binario(path):
+    return os.path.splitext(path)[1].lower() == EXTENSION
+
+def empaquetar_cabecera(fs, vref, offset, inicio, num_muestras=0, bits=12):
+    # num_muestras = 0 indica que el total se deduce del tamaño del archivo
+    return _CABECERA.pack(MAGIA, VERSION, bits, fs, vref, offset, inicio, num_muestras)
+
+class RegistroBin:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            datos = f.read(TAM_CABECERA)
+        if len(datos) < TAM_CABECERA:
+            raise ValueError(f"El archivo '{path}' no tiene una cabecera válida.")
+
+        magia, version, bits, fs, vref, offset, inicio, num_muestras = _CABECERA.unpack(datos)
+        if magia != MAGIA:
+            raise ValueError(f"El archivo '{path}' no es un registro {EXTENSION}.")
+        if version > VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        # fs = 0 queda en la cabecera si la adquisición se cortó antes de medir la tasa
+        if not fs > 0:
+            raise ValueError(f"El archivo '{path}' no tiene una frecuencia de muestreo válida ({fs}).")
+
+        self.bits = bits
+        self.fs = fs
+        self.vref = vref
+        self.offset = offset
+        self.inicio = inicio
+
+        # Si la adquisición se cortó antes de cerrar la cabecera, se usan las
+        # muestras completas que realmente llegaron al disco
+        disponibles = (os.path.getsize(path) - TAM_CABECERA) // 2
+        self.num_muestras = min(num_muestras, disponibles) if num_muestras else disponibles
+
+        if self.num_muestras > 0:
+            self.codigos = np.memmap(path, dtype="<i2", mode="r",
+                                     offset=TAM_CABECERA, shape=(self.num_muestras,))
+        else:
+            self.codigos = np.zeros(0, dtype="<i2")
+
+    def __len__(self):
+        return self.num_muestras
+
+    @property
+    def escala(self):
+        return self.vref / (2 ** self.bits - 1)
+
+    def a_voltios(self, codigos):
+        return codigos.astype(np.float64) * self.escala - self.offset
+
+    def voltios(self, inicio=0, fin=None):
+        return self.a_voltios(self.codigos[inicio:fin])
+
+    def tiempo(self, inicio=0, fin=None):
+        fin = self.num_muestras if fin is None else min(fin, self.num_muestras)
+        return np.arange(inicio, fin, dtype=np.float64) / self.fs
+
+def abrir_bin(path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No se encontró el archivo '{path}'")
+    return RegistroBin(path)
+
+def escribir_bin(path, codigos, fs, vref, offset, inicio, bits=12):
+    codigos = np.asarray(codigos, dtype="<i2")
+    with open(path, "wb") as f:
+        f.write(empaquetar_cabecera(fs, vref, offset, inicio, len(codigos), bits))
+        f.write(codigos.tobytes())
+    return path
+
+def leer_senal(path):
+    # Devuelve (tiempo, voltios) como arreglos NumPy, sea cual sea el formato
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No se encontró el archivo '{path}'")
+
+    if es_binario(path):
+        reg = RegistroBin(path)
+        return reg.tiempo(), reg.voltios()
+
+    # pandas solo se necesita para CSV; se importa aquí para no retrasar el arranque
+    import pandas as pd
+    df = pd.read_csv(path)
+    for columna in (COLUMNA_TIEMPO, COLUMNA_VOLTAJE):
+        if columna not in df.columns:
+            raise ValueError(f"No se encontró la columna '{columna}' en el archivo CSV.")
+    return df[COLUMNA_TIEMPO].values, df[COLUMNA_VOLTAJE].values
+
+def exportar_csv(path_bin, path_csv=None):
+    if path_csv is None:
+        path_csv = os.path.splitext(path_bin)[0] + ".csv"
+
+    reg = abrir_bin(path_bin)
+    with open(path_csv, "w", newline='') as f:
+        f.write(f"{COLUMNA_TIEMPO},{COLUMNA_VOLTAJE}\n")
+        for i in range(0, len(reg), MUESTRAS_POR_BLOQUE):
+            fin = i + MUESTRAS_POR_BLOQUE
+            np.savetxt(f, np.column_stack((reg.tiempo(i, fin), reg.voltios(i, fin))),
+                       delimiter=",", fmt="%.6f")
+    return path_csv
+
+def importar_csv(path_csv, path_bin=None, vref=3.0, bits=12):
+    if path_bin is None:
+        path_bin = os.path.splitext(path_csv)[0] + EXTENSION
+
+    tiempo, voltios = leer_senal(path_csv)
+    if len(voltios) < 2:
+        raise ValueError("El archivo CSV no contiene suficientes datos.")
+
+    # El CSV guarda la señal ya centrada; se recupera el código ADC
+    # desplazando media escala
+    escala = vref / (2 ** bits - 1)
+    offset = vref / 2
+    codigos = np.clip(np.round((voltios + offset) / escala), 0, 2 ** bits - 1)
+    fs = (len(tiempo) - 1) / (tiempo[-1] - tiempo[0])
+
+    return escribir_bin(path_bin, codigos, fs, vref, offset, 0.0, bits)
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("exportar", "importar"):
+        print(f"Uso: python -m core.formato_bin exportar archivo{EXTENSION}")
+        print("     python -m core.formato_bin importar archivo.csv")
+    elif sys.argv[1] == "exportar":
+        print(f"Archivo CSV '{exportar_csv(sys.argv[2])}' generado exitosamente.")
+    else:
+        print(f"Registro '{importar_csv(sys.argv[2])}' generado exitosamente.")
@@ -0,0 +1,195 @@
+import time, sys
+import numpy as np
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from utils.monitor_spi import uso_adquisicion
+
+# Interfaz común de las fuentes de códigos del ADC. Los motores de
+# adquisición (adquirir_csv, adquirir_bloques, AdquisicionStream) solo usan
+# abrir/cerrar (o el bloque with) y leer_bloque/leer_muestra, así que el
+# hardware real y las fuentes simuladas son intercambiables. Una fuente sin
+# leer_bloque falla al crearla, no a mitad de una adquisición.
+class FuenteAdc(ABC):
+    # Las fuentes que usan el bus SPI lo reservan mientras están abiertas
+    usa_bus_spi = False
+    por_lotes = True
+
+    def abrir(self):
+        return self
+
+    def cerrar(self):
+        pass
+
+    @abstractmethod
+    def leer_bloque(self, n, salida=None):
+        # Lee n códigos en 'salida' (o en un arreglo nuevo) y lo devuelve
+        pass
+
+    def leer_muestra(self):
+        return int(self.leer_bloque(1)[0])
+
+    def __enter__(self):
+        self._uso = uso_adquisicion() if self.usa_bus_spi else nullcontext()
+        self._uso.__enter__()
+        try:
+            return self.abrir()
+        except BaseException:
+            self._uso.__exit__(None, None, None)
+            raise
+
+    def __exit__(self, *exc):
+        try:
+            self.cerrar()
+        finally:
+            self._uso.__exit__(None, None, None)
+
+class FuenteGpiozero(FuenteAdc):
+    # Lectura muestra a muestra con gpiozero.MCP3202
+    usa_bus_spi = True
+    por_lotes = False
+
+    def __init__(self, canal=0, device=0):
+        self.canal = canal
+        self.device = device
+        self.adc = None
+
+    def abrir(self):
+        from gpiozero import MCP3202
+        self.adc = MCP3202(channel=self.canal, device=self.device)
+        return self
+
+    def cerrar(self):
+        if self.adc is not None:
+            self.adc.close()
+            self.adc = None
+
+    def leer_muestra(self):
+        return self.adc.raw_value
+
+    def leer_bloque(self, n, salida=None):
+        if salida is None:
+            salida = np.empty(n, dtype=np.uint16)
+        for i in range(n):
+            salida[i] = self.adc.raw_value
+        return salida
+
+class FuenteSimulada(FuenteAdc):
+    # Reproduce códigos a una tasa fija en tiempo real, como un ADC que
+    # convierte continuamente con una FIFO de tamaño limitado:
+    #  - fs: conversiones por segundo
+    #  - latencia_s / jitter_s: demora fija y aleatoria (uniforme) por lectura,
+    #    como la de un ioctl SPI
+    #  - fifo: muestras que se retienen; si el lector se atrasa más, se
+    #    pierden las más antiguas y se cuentan en 'perdidas'
+    def __init__(self, codigos, fs, latencia_s=0.0, jitter_s=0.0, fifo=4096, bucle=True, semilla=0):
+        self.codigos = np.asarray(codigos, dtype=np.uint16)
+        if len(self.codigos) == 0:
+            raise ValueError("La fuente simulada necesita al menos una muestra.")
+        self.fs = float(fs)
+        self.latencia_s = latencia_s
+        self.jitter_s = jitter_s
+        self.fifo = fifo
+        self.bucle = bucle
+        self._rng = np.random.default_rng(semilla)
+        self._t0 = None
+        self.posicion = 0
+        self.perdidas = 0
+        self.lecturas = 0
+
+    @classmethod
+    def sintetica(cls, duracion_s=10.0, fs=8000, **kwargs):
+        from utils.senal_sintetica import auscultacion, a_codigos
+        return cls(a_codigos(auscultacion(duracion_s, fs)[1]), fs, **kwargs)
+
+    @classmethod
+    def desde_archivo(cls, path, fs=None, **kwargs):
+        # WAV, CSV o .ausc; fs por defecto es la del archivo
+        from utils.senal_sintetica import a_codigos
+        if path.lower().endswith(".wav"):
+            from scipy.io import wavfile
+            fs_archivo, datos = wavfile.read(path)
+            datos = datos.astype(np.float64)
+            if datos.ndim > 1:
+                datos = datos.mean(axis=1)
+            pico = np.max(np.abs(datos)) or 1.0
+            # Se lleva al rango típico de la señal adquirida (±0.5 V)
+            voltios = 0.5 * datos / pico
+        else:
+            from core.cargar_senal import cargar_senal
+            senal = cargar_senal(path)
+            fs_archivo, voltios = senal.fs, senal.voltios
+        return cls(a_codigos(voltios), fs or fs_archivo, **kwargs)
+
+    def abrir(self):
+        self._t0 = time.perf_counter()
+        self.posicion = 0
+        self.perdidas = 0
+        self.lecturas = 0
+        return self
+
+    def cerrar(self):
+        self._t0 = None
+
+    @property
+    def agotada(self):
+        return not self.bucle and self.posicion >= len(self.codigos)
+
+    def _producidas(self):
+        return int((time.perf_counter() - self._t0) * self.fs)
+
+    def leer_bloque(self, n, salida=None):
+        if salida is None:
+            salida = np.empty(n, dtype=np.uint16)
+        if self._t0 is None:
+            raise RuntimeError("La fuente simulada no está abierta.")
+
+        # Desborde de la FIFO: el lector llegó tarde y se perdieron conversiones
+        atraso = self._producidas() - self.posicion - self.fifo
+        if atraso > 0:
+            self.perdidas += atraso
+            self.posicion += atraso
+
+        # Se espera a que estén convertidas las n muestras pedidas, más la
+        # demora de la transferencia (que se paga aunque ya estén disponibles)
+        espera = (self.posicion + n) / self.fs - (time.perf_counter() - self._t0)
+        demora = self.latencia_s + (self._rng.uniform(0, self.jitter_s) if self.jitter_s else 0.0)
+        if max(espera, 0) + demora > 0:
+            time.sleep(max(espera, 0) + demora)
+
+        idx = self.posicion + np.arange(n)
+        if self.bucle:
+            idx %= len(self.codigos)
+        else:
+            idx = np.minimum(idx, len(self.codigos) - 1)
+        salida[:n] = self.codigos[idx]
+        self.posicion += n
+        self.lecturas += 1
+        return salida
+
+# Motores disponibles por nombre (la fuente SPI se importa solo si se pide)
+def crear_fuente(tipo, **kwargs):
+    if tipo == "spi":
+        from core.adc_spi import LectorSpi
+        return LectorSpi(**kwargs)
+    if tipo == "gpiozero":
+        return FuenteGpiozero(**kwargs)
+    if tipo == "simulada":
+        path = kwargs.pop("path", None)
+        if path:
+            return FuenteSimulada.desde_archivo(path, **kwargs)
+        return FuenteSimulada.sintetica(**kwargs)
+    raise ValueError(f"Tipo de fuente desconocido: {tipo}")
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m core.fuentes_adc archivo.wav|archivo.csv [segundos]")
+    else:
+        segundos = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+        fuente = FuenteSimulada.desde_archivo(sys.argv[1])
+        with fuente:
+            inicio = time.perf_counter()
+            n = 0
+            while time.perf_counter() - inicio < segundos:
+                n += len(fuente.leer_bloque(512))
+        print(f"{n} muestras en {segundos:.1f} s ({n / segundos:.0f} Hz, fuente a {fuente.fs:.0f} Hz)")
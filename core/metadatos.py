@@ -0,0 +1,41 @@
+import numpy as np
+import sys, os
+from core.cargar_senal import cargar_senal
+from core.espectro import espectro
+from core.remuestreo import uniformizar
+
+def metadatos_senal(senal):
+    # Las claves coinciden con core.basedatos.CAMPOS_SENAL
+    v = senal.voltios
+    n = len(v)
+    if n == 0:
+        raise ValueError(f"El archivo '{senal.path}' no contiene datos.")
+
+    datos = {
+        "duracion": float(senal.tiempo[-1] - senal.tiempo[0]),
+        "fs": float(senal.fs),
+        "num_muestras": int(n),
+        "v_min": float(v.min()),
+        "v_max": float(v.max()),
+        "rms": float(np.sqrt(np.mean(np.square(v)))),
+        "f_dominante": None,
+    }
+    # Frecuencia dominante sin la componente continua
+    if n > 1 and senal.fs > 0:
+        # El espectro supone tasa uniforme: se calcula sobre la señal regularizada
+        uniforme = uniformizar(senal)
+        f, amp, _ = espectro(uniforme.voltios, uniforme.fs)
+        if len(f) > 1:
+            datos["f_dominante"] = float(f[1 + np.argmax(amp[1:])])
+    return datos
+
+def calcular_metadatos(path):
+    return metadatos_senal(cargar_senal(path))
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m core.metadatos archivo.csv")
+    else:
+        for campo, valor in calcular_metadatos(sys.argv[1]).items():
+            print(f"{campo}: {valor}")
@@ -1,21 +1,127 @@
-import joblib, librosa, os
+import os, threading
 import numpy as np
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from utils import trazas
 
-# Cargar modelo entrenado
+# Modelo entrenado: se carga en el primer uso, no al importar el módulo
 model_path = os.path.join(os.path.dirname(__file__), "..", "models", "modelo_svm.pkl")
-modelo = joblib.load(model_path)
+_modelo = {"pipeline": None}
+_lock = threading.Lock()
 
+# Clase 0 / clase 1 del modelo
+ETIQUETAS = ("Healthy", "COPD")
+EXTENSIONES_AUDIO = (".wav",)
+
+# Resultado por archivo; 'error' queda en None si la predicción fue correcta
+Prediccion = namedtuple("Prediccion", ["archivo", "etiqueta", "confianza", "puntaje", "error"])
+
+def obtener_modelo():
+    with _lock:
+        if _modelo["pipeline"] is None:
+            import joblib
+            pipeline = joblib.load(model_path)
+            # Calentamiento: la primera llamada paga la inicialización interna
+            # de scikit-learn/BLAS; se hace aquí y no con la primera señal real
+            vacio = np.zeros((1, pipeline.n_features_in_))
+            pipeline.predict(vacio)
+            pipeline.decision_function(vacio)
+            _modelo["pipeline"] = pipeline
+        return _modelo["pipeline"]
+
+@trazas.trazar("caracteristicas")
 def extract_features(file_path, n_mfcc=13):
+    import librosa
     y, sr = librosa.load(file_path, sr=None)
     mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
     return np.mean(mfcc.T, axis=0)
 
+@trazas.trazar("caracteristicas")
+def extract_features_senal(voltios, fs, n_mfcc=13):
+    # Cuantización a int16 con pico ESCALA_PCM y vuelta a [-1, 1] como lo
+    # hace librosa.load, sin pasar por el disco. No equivale a clasificar un
+    # WAV exportado: aquí los MFCC usan la Fs real de la señal, y csv_to_wav
+    # escribe a otra escala (ESCALA_AUDIO) y, antes, a 6800 Hz fijos
+    import librosa
+    from core.csv_to_wav import a_pcm16
+    y = a_pcm16(np.asarray(voltios)).astype(np.float32) / 32768.0
+    mfcc = librosa.feature.mfcc(y=y, sr=fs, n_mfcc=n_mfcc)
+    return np.mean(mfcc.T, axis=0)
+
+def confianza(puntajes):
+    # El SVM no está calibrado (probability=False): la sigmoide de la distancia
+    # al hiperplano da una confianza monótona en [0.5, 1], no una probabilidad
+    return 1.0 / (1.0 + np.exp(-np.abs(puntajes)))
+
 def predict_audio(file_path):
     feat = extract_features(file_path).reshape(1, -1)
-    pred = modelo.predict(feat)[0]
+    with trazas.tramo("modelo", "prediccion"):
+        pred = obtener_modelo().predict(feat)[0]
     return "Healthy" if pred == 0 else "COPD"
 
+def predict_senal(voltios, fs, nombre=None):
+    # Clasificación directa de un arreglo en memoria (adquisición o señal cargada)
+    if fs <= 0:
+        raise ValueError("La señal no tiene una frecuencia de muestreo válida.")
+    modelo = obtener_modelo()
+    feat = extract_features_senal(voltios, fs).reshape(1, -1)
+    with trazas.tramo("modelo", "prediccion"):
+        puntaje = modelo.decision_function(feat)
+        pred = modelo.predict(feat)[0]
+    return Prediccion(nombre, ETIQUETAS[int(pred)], float(confianza(puntaje)[0]),
+                      float(puntaje[0]), None)
+
+def predict_batch(archivos, max_hilos=None):
+    archivos = list(archivos)
+    if not archivos:
+        return []
+    modelo = obtener_modelo()
+
+    def extraer(path):
+        try:
+            return extract_features(path), None
+        except Exception as e:
+            return None, e
+
+    # La lectura del WAV y las FFT de librosa liberan el GIL, así que los hilos
+    # solapan la extracción sin el costo de serializar datos entre procesos
+    max_hilos = max_hilos or min(len(archivos), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_hilos) as pool:
+        extraidos = list(pool.map(extraer, archivos))
+
+    validos = [i for i, (feat, _) in enumerate(extraidos) if feat is not None]
+    resultados = [Prediccion(path, None, 0.0, float("nan"), error)
+                  for path, (_, error) in zip(archivos, extraidos)]
+    if not validos:
+        return resultados
+
+    # Una sola llamada al modelo para toda la matriz de características
+    X = np.vstack([extraidos[i][0] for i in validos])
+    with trazas.tramo("modelo", "prediccion", filas=len(X)):
+        preds = modelo.predict(X)
+        puntajes = modelo.decision_function(X)
+    for i, pred, puntaje, conf in zip(validos, preds, puntajes, confianza(puntajes)):
+        resultados[i] = Prediccion(archivos[i], ETIQUETAS[int(pred)], float(conf),
+                                   float(puntaje), None)
+    return resultados
+
+def predict_carpeta(carpeta, max_hilos=None):
+    archivos = sorted(os.path.join(carpeta, nombre) for nombre in os.listdir(carpeta)
+                      if nombre.lower().endswith(EXTENSIONES_AUDIO))
+    return predict_batch(archivos, max_hilos)
+
 if __name__ == "__main__":
-    # Ejemplo de prueba
-    ruta = "ejemplo.wav"
-    print("Predicción:", predict_audio(ruta))
+    import sys
+    if len(sys.argv) < 2:
+        print("Uso: python -m core.predict archivo.wav [archivo2.wav ...]")
+        print("     python -m core.predict carpeta/")
+    else:
+        if len(sys.argv) == 2 and os.path.isdir(sys.argv[1]):
+            resultados = predict_carpeta(sys.argv[1])
+        else:
+            resultados = predict_batch(sys.argv[1:])
+        for r in resultados:
+            if r.error is not None:
+                print(f"{os.path.basename(r.archivo)}: error ({r.error!r})")
+            else:
+                print(f"{os.path.basename(r.archivo)}: {r.etiqueta} (confianza {r.confianza:.2f})")
@@ -0,0 +1,136 @@
+import os, sys, threading
+import numpy as np
+from collections import OrderedDict
+from fractions import Fraction
+from core.cargar_senal import cargar_senal, Senal
+from core.espectro import estadisticas_tiempo
+from utils import trazas
+
+# Las marcas de adquirir_csv vienen de time.time(), con espaciado irregular.
+# FFT, Welch, STFT, wavelet, WAV y MFCC suponen una tasa uniforme: esta etapa
+# interpola las muestras sobre una rejilla uniforme a la Fs estimada y, si se
+# pide otra tasa, la convierte con resample_poly. Todo se procesa por tramos
+# para que los temporales no crezcan con la longitud del registro.
+TAM_TRAMO = 1 << 20
+# Jitter (relativo al periodo) por debajo del cual la señal ya se considera uniforme
+TOLERANCIA_JITTER = 0.01
+# Denominador máximo de la razón up/down de resample_poly
+MAX_DENOMINADOR = 1000
+# Señales regularizadas guardadas (una por archivo y tasa destino)
+CACHE_MAX = 4
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def es_uniforme(tiempo):
+    est = estadisticas_tiempo(tiempo)
+    return est["huecos"] == 0 and est["jitter"] * est["fs"] <= TOLERANCIA_JITTER
+
+def a_rejilla(tiempo, voltios, fs, tam_tramo=TAM_TRAMO):
+    # Interpolación lineal sobre t0 + k / fs, por tramos de la rejilla. Los
+    # huecos (pausas del sistema) quedan rellenos con la recta entre sus extremos
+    tiempo = np.asarray(tiempo, dtype=np.float64)
+    voltios = np.asarray(voltios, dtype=np.float64)
+    if np.any(np.diff(tiempo) < 0):
+        # Saltos del reloj hacia atrás: se ordenan las marcas
+        orden = np.argsort(tiempo, kind="stable")
+        tiempo, voltios = tiempo[orden], voltios[orden]
+
+    t0 = tiempo[0]
+    n = int(np.floor((tiempo[-1] - t0) * fs + 1e-9)) + 1
+    salida = np.empty(n, dtype=np.float64)
+    for k0 in range(0, n, tam_tramo):
+        k1 = min(k0 + tam_tramo, n)
+        t = t0 + np.arange(k0, k1) / fs
+        # Solo la parte de la señal que cubre este tramo de la rejilla
+        i0 = max(np.searchsorted(tiempo, t[0], side="right") - 1, 0)
+        i1 = min(np.searchsorted(tiempo, t[-1], side="left") + 1, len(tiempo))
+        salida[k0:k1] = np.interp(t, tiempo[i0:i1], voltios[i0:i1])
+    return salida
+
+def a_tasa(voltios, fs, fs_destino, tam_tramo=TAM_TRAMO):
+    # Conversión de tasa polifásica; devuelve (voltios, fs resultante). La
+    # razón se aproxima a una fracción, así que la Fs final puede diferir
+    # mínimamente de fs_destino
+    from scipy.signal import resample_poly
+    razon = Fraction(fs_destino / fs).limit_denominator(MAX_DENOMINADOR)
+    up, down = razon.numerator, razon.denominator
+    if up == down:
+        return voltios, fs
+    fs_final = fs * up / down
+
+    n = len(voltios)
+    if n <= tam_tramo:
+        return resample_poly(voltios, up, down), fs_final
+
+    # Por tramos con margen a cada lado: el filtro de resample_poly abarca
+    # 10 * max(up, down) muestras de la señal sobremuestreada a cada lado.
+    # Los bordes de los tramos son múltiplos de 'down' para que las muestras
+    # de salida caigan en índices enteros
+    margen = -(-(10 * max(up, down) // up + 2) // down) * down
+    paso = max(tam_tramo // down, 1) * down
+    salida = np.empty(-(-n * up // down), dtype=np.float64)
+    for i0 in range(0, n, paso):
+        i1 = min(i0 + paso, n)
+        a, b = max(i0 - margen, 0), min(i1 + margen, n)
+        y = resample_poly(voltios[a:b], up, down)
+        o = a * up // down
+        j0, j1 = i0 * up // down, -(-i1 * up // down)
+        salida[j0:j1] = y[j0 - o:j1 - o]
+    return salida, fs_final
+
+@trazas.trazar("dsp", "uniformizar")
+def uniformizar(senal, fs_destino=None):
+    # Senal con marcas irregulares -> Senal en rejilla uniforme (a fs_destino si se indica)
+    if len(senal.voltios) < 2 or senal.fs <= 0:
+        return senal
+    voltios, fs = senal.voltios, senal.fs
+    if not es_uniforme(senal.tiempo):
+        voltios = a_rejilla(senal.tiempo, voltios, fs)
+    elif not fs_destino:
+        return senal
+    if fs_destino:
+        voltios, fs = a_tasa(voltios, fs, fs_destino)
+    tiempo = senal.tiempo[0] + np.arange(len(voltios)) / fs
+    return Senal(tiempo, voltios, fs, senal.path)
+
+def senal_uniforme(path, fs_destino=None):
+    # Versión regularizada de cargar_senal, compartida por todos los análisis
+    senal = cargar_senal(path)
+    st = os.stat(senal.path)
+    clave = (senal.path, st.st_mtime_ns, st.st_size, fs_destino)
+
+    with _lock:
+        if clave in _cache:
+            _cache.move_to_end(clave)
+            return _cache[clave]
+
+    uniforme = uniformizar(senal, fs_destino)
+    # Si ya era uniforme se devuelve la misma Senal de la caché de carga
+    if uniforme is senal:
+        return senal
+
+    with _lock:
+        for vieja in [c for c in _cache if c[0] == senal.path and c[1:3] != clave[1:3]]:
+            del _cache[vieja]
+        _cache[clave] = uniforme
+        while len(_cache) > CACHE_MAX:
+            _cache.popitem(last=False)
+    return uniforme
+
+def limpiar_cache():
+    with _lock:
+        _cache.clear()
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m core.remuestreo archivo.csv [fs_destino]")
+    else:
+        original = cargar_senal(sys.argv[1])
+        est = estadisticas_tiempo(original.tiempo)
+        print(f"Original: {len(original.voltios)} muestras, Fs {est['fs']:.2f} Hz, "
+              f"jitter {est['jitter'] * 1e6:.1f} us, {est['huecos']} huecos")
+        destino = float(sys.argv[2]) if len(sys.argv) > 2 else None
+        uniforme = senal_uniforme(sys.argv[1], destino)
+        print(f"Uniforme: {len(uniforme.voltios)} muestras a {uniforme.fs:.2f} Hz")
@@ -0,0 +1,147 @@
+import sys, threading
+import numpy as np
+
+# Reproducción en el mismo proceso con sounddevice.OutputStream: el audio sale
+# directo del arreglo en memoria, sin WAV temporal ni reproductores externos
+PICO_AUDIO = 0.9                # pico de la señal normalizada (float32, ±1 es el máximo)
+TASAS_DISPOSITIVO = (48000, 44100)
+BLOQUE = 1024
+
+DETENIDO = "detenido"
+REPRODUCIENDO = "reproduciendo"
+PAUSADO = "pausado"
+
+def tasa_salida(sd, fs, dispositivo=None):
+    # Se usa la Fs real si el dispositivo la acepta; si no, la primera que acepte
+    for tasa in (int(round(fs)),) + TASAS_DISPOSITIVO:
+        try:
+            sd.check_output_settings(device=dispositivo, samplerate=tasa, channels=1, dtype="float32")
+            return tasa
+        except Exception:
+            continue
+    raise RuntimeError(f"El dispositivo de audio no admite {fs:.0f} Hz ni las tasas estándar.")
+
+def preparar_audio(voltios, fs, fs_salida):
+    # Quita la componente continua, normaliza y remuestrea a la tasa de salida
+    voltios = np.asarray(voltios, dtype=np.float64)
+    voltios = voltios - voltios.mean()
+    pico = np.max(np.abs(voltios)) if len(voltios) else 0.0
+    if pico == 0:
+        raise ValueError("La señal es plana (voltaje constante), no se puede reproducir.")
+    audio = voltios * (PICO_AUDIO / pico)
+
+    if fs_salida != fs:
+        from core.remuestreo import a_tasa
+        audio = np.clip(a_tasa(audio, fs, fs_salida)[0], -1.0, 1.0)
+    return audio.astype(np.float32)
+
+def preparar(voltios, fs, dispositivo=None):
+    # Parte costosa (copia, normalización y remuestreo): se llama fuera del
+    # hilo de Tk. Sin sounddevice/PortAudio lanza ImportError u OSError, y
+    # RuntimeError si el dispositivo no admite ninguna tasa
+    if fs <= 0:
+        raise ValueError("La señal no tiene una frecuencia de muestreo válida.")
+    import sounddevice as sd
+    fs_salida = tasa_salida(sd, fs, dispositivo)
+    return preparar_audio(voltios, fs, fs_salida), fs_salida
+
+class Reproductor:
+    def __init__(self, audio, fs_salida, dispositivo=None):
+        # audio: arreglo float32 de preparar(); solo se crea el stream
+        import sounddevice as sd
+        self._sd = sd
+        self.fs_salida = fs_salida
+        self.audio = audio
+        self.duracion = len(self.audio) / self.fs_salida
+        self.estado = DETENIDO
+        # Índice de la próxima muestra a enviar; lo escribe el callback y buscar()
+        self._pos = 0
+        self._lock = threading.Lock()
+        self._stream = sd.OutputStream(samplerate=self.fs_salida, channels=1, dtype="float32",
+                                       blocksize=BLOQUE, device=dispositivo,
+                                       callback=self._callback, finished_callback=self._al_terminar)
+
+    @property
+    def posicion(self):
+        # Segundos desde el inicio de la señal
+        return self._pos / self.fs_salida
+
+    def _callback(self, salida, frames, tiempo, status):
+        with self._lock:
+            i = self._pos
+            n = min(frames, len(self.audio) - i)
+            salida[:n, 0] = self.audio[i:i + n]
+            salida[n:] = 0
+            self._pos = i + n
+        if n < frames:
+            raise self._sd.CallbackStop
+
+    def _al_terminar(self):
+        # El stream se detuvo (fin de la señal, pausa o detener). Corre en el
+        # hilo de PortAudio: estado y posición se cambian con el candado
+        with self._lock:
+            if self.estado == REPRODUCIENDO:
+                self.estado = DETENIDO
+                self._pos = 0
+
+    def reproducir(self):
+        with self._lock:
+            if self.estado == REPRODUCIENDO:
+                return
+            if self._pos >= len(self.audio):
+                self._pos = 0
+        # Tras CallbackStop el stream queda inactivo pero sin detener. stop()
+        # espera al finished_callback, así que no se llama con el candado tomado
+        if not self._stream.stopped:
+            self._stream.stop()
+        with self._lock:
+            self.estado = REPRODUCIENDO
+        self._stream.start()
+
+    def pausar(self):
+        with self._lock:
+            if self.estado != REPRODUCIENDO:
+                return
+            self.estado = PAUSADO
+        self._stream.stop()
+
+    def alternar(self):
+        if self.estado == REPRODUCIENDO:
+            self.pausar()
+        else:
+            self.reproducir()
+
+    def buscar(self, segundos):
+        with self._lock:
+            self._pos = int(min(max(segundos, 0.0), self.duracion) * self.fs_salida)
+
+    def detener(self):
+        with self._lock:
+            self.estado = DETENIDO
+        self._stream.stop()
+        with self._lock:
+            self._pos = 0
+
+    def cerrar(self):
+        self.detener()
+        self._stream.close()
+
+def reproducir_senal(senal):
+    # Atajo para la consola: reproduce una Senal completa y espera a que termine
+    reproductor = Reproductor(*preparar(senal.voltios, senal.fs))
+    reproductor.reproducir()
+    try:
+        while reproductor.estado == REPRODUCIENDO:
+            reproductor._sd.sleep(100)
+    finally:
+        reproductor.cerrar()
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m core.reproductor archivo.csv")
+    else:
+        from core.cargar_senal import cargar_senal
+        senal = cargar_senal(sys.argv[1])
+        print(f"Reproduciendo {len(senal.voltios)} muestras a {senal.fs:.0f} Hz")
+        reproducir_senal(senal)
@@ -0,0 +1,17 @@
+import threading
+
+# Señales en memoria compartidas entre pestañas (tuplas Senal de
+# core.cargar_senal): la última adquisición y la señal abierta en análisis
+ADQUISICION = "adquisicion"
+ANALISIS = "analisis"
+
+_senales = {ADQUISICION: None, ANALISIS: None}
+_lock = threading.Lock()
+
+def publicar(clave, senal):
+    with _lock:
+        _senales[clave] = senal
+
+def obtener(clave):
+    with _lock:
+        return _senales[clave]
@@ -0,0 +1,66 @@
+import numpy as np
+import os, sys, hashlib, threading
+from core.basedatos import DB_PATH
+from core.decimacion import indices_minmax
+from core.formato_bin import es_binario, abrir_bin
+from utils import trazas
+
+# Envolventes mín/máx precalculadas, junto a la base de datos. Cada archivo
+# guarda el mtime y tamaño de la señal de origen: si no coinciden, se rehace
+DIRECTORIO = os.path.join(os.path.dirname(DB_PATH), "previews")
+COLUMNAS = 600
+
+_lock = threading.Lock()
+
+def _ruta_preview(path, directorio):
+    nombre = hashlib.sha1(os.path.abspath(path).encode()).hexdigest() + ".npz"
+    return os.path.join(directorio, nombre)
+
+@trazas.trazar("carga", "vista_previa")
+def _calcular(path, columnas):
+    if es_binario(path):
+        # Directo sobre el memmap de códigos: no se convierte todo a voltios
+        reg = abrir_bin(path)
+        idx = indices_minmax(reg.codigos, columnas)
+        return idx / reg.fs if reg.fs else idx.astype(np.float64), reg.a_voltios(reg.codigos[idx])
+
+    from core.cargar_senal import cargar_senal
+    senal = cargar_senal(path)
+    idx = indices_minmax(senal.voltios, columnas)
+    return senal.tiempo[idx], senal.voltios[idx]
+
+def vista_previa(path, columnas=COLUMNAS, directorio=DIRECTORIO):
+    # Devuelve (tiempo, voltios) de la envolvente, calculándola solo si hace falta
+    st = os.stat(path)
+    ruta = _ruta_preview(path, directorio)
+    try:
+        with np.load(ruta) as datos:
+            if int(datos["mtime_ns"]) == st.st_mtime_ns and int(datos["tam"]) == st.st_size:
+                return datos["tiempo"], datos["voltios"]
+    except (OSError, KeyError, ValueError):
+        pass
+
+    tiempo, voltios = _calcular(path, columnas)
+    with _lock:
+        os.makedirs(directorio, exist_ok=True)
+        tmp = ruta + ".tmp.npz"
+        np.savez(tmp, tiempo=tiempo.astype(np.float32), voltios=voltios.astype(np.float32),
+                 mtime_ns=st.st_mtime_ns, tam=st.st_size)
+        os.replace(tmp, ruta)
+    return tiempo, voltios
+
+def generar(archivos, directorio=DIRECTORIO):
+    # Precalcula las vistas previas de varias señales; ignora las ilegibles
+    for path in archivos:
+        try:
+            vista_previa(path, directorio=directorio)
+        except Exception as e:
+            print(f"No se pudo generar la vista previa de {path}: {e}")
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m core.vista_previa archivo.csv [archivo2.csv ...]")
+    else:
+        generar(sys.argv[1:])
+        print(f"Vistas previas guardadas en '{DIRECTORIO}'")
@@ -1,7 +1,7 @@
 import customtkinter as ctk
 from datetime import datetime
 
-def create_footer(root, check_spi_func):
+def create_footer(root, monitor):
     footer = ctk.CTkFrame(root, fg_color="transparent")
     footer.grid(row=3, column=0, sticky="ew", padx=16, pady=(0, 12))
     footer.grid_columnconfigure(1, weight=1)
@@ -24,18 +24,33 @@ def create_footer(root, check_spi_func):
     )
     credit.grid(row=0, column=2, sticky="e")
 
+    # Estadísticas del monitor del dispositivo
+    stats_label = ctk.CTkLabel(footer, text="", font=(None, 12), text_color="#555555")
+    stats_label.grid(row=1, column=0, columnspan=3, sticky="w")
+
     def update_time_and_status():
-        # Actualiza hora y estado SPI cada segundo.
+        # Actualiza hora y estado cada segundo. El estado lo mantiene el hilo
+        # del monitor: aquí solo se lee, sin tocar el bus SPI
         now = datetime.now().strftime("%H:%M:%S")
         time_label.configure(text=now)
 
-        try:
-            connected = check_spi_func()
-        except Exception:
-            connected = False
-        status_label.configure(
-            text=f"Estado del dispositivo: {'Activo' if connected else 'Desconectado'}"
-        )
+        estado = monitor.estado
+        if estado["conectado"] is None:
+            texto = "comprobando..."
+        elif estado["adquiriendo"]:
+            texto = "Adquiriendo"
+        else:
+            texto = "Activo" if estado["conectado"] else "Desconectado"
+        status_label.configure(text=f"Estado del dispositivo: {texto}")
+
+        visto = (datetime.fromtimestamp(estado["ultimo_visto"]).strftime("%H:%M:%S")
+                 if estado["ultimo_visto"] else "nunca")
+        latencia = f"{estado['latencia_ms']:.1f} ms" if estado["latencia_ms"] is not None else "--"
+        stats = (f"Visto: {visto}   Sondeos: {estado['sondeos']}   Errores: {estado['errores']}"
+                 f"   Omitidos (adquisición): {estado['omitidos']}   Latencia: {latencia}")
+        if estado["ultimo_error"] and not estado["conectado"]:
+            stats += f"   Último error: {estado['ultimo_error']}"
+        stats_label.configure(text=stats)
         root.after(1000, update_time_and_status)
     # Arrancar primer ciclo
     update_time_and_status()
@@ -0,0 +1,65 @@
+import customtkinter as ctk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from core.adquirircsv import VREF, NUM_BITS, OFFSET
+from core.decimacion import indices_minmax
+
+# Refresco de la vista en vivo
+FPS = 20
+VENTANA_S = 2.0
+
+def create_osciloscopio(parent, obtener_stream):
+    frame = ctk.CTkFrame(parent, fg_color="white")
+
+    fig = Figure(figsize=(6, 2.5))
+    ax = fig.add_subplot()
+    ax.set_title('Señal en vivo')
+    ax.set_xlabel('Tiempo (s)')
+    ax.set_ylabel('Voltios')
+    ax.set_xlim(-VENTANA_S, 0)
+    ax.set_ylim(-1.5, 1.5)
+    ax.grid(True)
+    fig.tight_layout()
+
+    # Artistas animados: solo se redibujan ellos sobre el fondo guardado
+    linea, = ax.plot([], [], color='r', linewidth=0.5, animated=True)
+    texto = ax.text(0.01, 0.95, "Sin adquisición en curso", transform=ax.transAxes,
+                    va="top", fontsize=8, animated=True)
+
+    canvas = FigureCanvasTkAgg(fig, master=frame)
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    estado = {"fondo": None}
+    escala = VREF / (2 ** NUM_BITS - 1)
+
+    def guardar_fondo(event):
+        estado["fondo"] = canvas.copy_from_bbox(ax.bbox)
+        ax.draw_artist(linea)
+        ax.draw_artist(texto)
+
+    canvas.mpl_connect("draw_event", guardar_fondo)
+
+    def actualizar():
+        stream = obtener_stream()
+        if stream is not None and stream.tasa > 0 and estado["fondo"] is not None:
+            # Solo se copia la ventana visible del buffer circular
+            n = int(VENTANA_S * stream.tasa)
+            codigos = stream.buffer.ultimos(n)
+            # Un par (mín, máx) por columna de píxeles para no perder picos
+            idx = indices_minmax(codigos, max(int(ax.bbox.width), 1))
+            linea.set_data((idx - len(codigos)) / stream.tasa, codigos[idx] * escala - OFFSET)
+            texto.set_text(f"Fs: {stream.tasa:.0f} Hz   Buffer: {stream.ocupacion:.0%}"
+                           + ("" if stream.activa else "   (detenida)"))
+
+            canvas.restore_region(estado["fondo"])
+            ax.draw_artist(linea)
+            ax.draw_artist(texto)
+            canvas.blit(ax.bbox)
+
+        if frame.winfo_exists():
+            frame.after(int(1000 / FPS), actualizar)
+
+    canvas.draw()
+    frame.after(int(1000 / FPS), actualizar)
+
+    return frame
@@ -0,0 +1,63 @@
+import customtkinter as ctk
+from tkinter import filedialog
+from utils import trazas, perfil_arranque
+
+# Tramos recientes mostrados bajo el resumen
+ULTIMOS = 40
+INTERVALO_MS = 1000
+
+_panel = {"ventana": None}
+
+def abrir_panel_trazas(root):
+    # Panel oculto de depuración (Ctrl+Shift+D): una sola ventana a la vez
+    if _panel["ventana"] is not None and _panel["ventana"].winfo_exists():
+        _panel["ventana"].focus()
+        return _panel["ventana"]
+
+    ventana = ctk.CTkToplevel(root)
+    ventana.title("Trazas de rendimiento")
+    ventana.geometry("900x600")
+    _panel["ventana"] = ventana
+
+    controles = ctk.CTkFrame(ventana, fg_color="transparent")
+    controles.pack(fill="x", padx=10, pady=(10, 4))
+
+    activo_var = ctk.BooleanVar(value=trazas.activas())
+    ctk.CTkSwitch(controles, text="Registrar tramos", variable=activo_var,
+                  command=lambda: trazas.activar(activo_var.get())).pack(side="left", padx=4)
+
+    estado_label = ctk.CTkLabel(controles, text="")
+    estado_label.pack(side="right", padx=4)
+
+    texto = ctk.CTkTextbox(ventana, font=("Courier", 12), wrap="none")
+    texto.pack(fill="both", expand=True, padx=10, pady=4)
+
+    def refrescar():
+        if not ventana.winfo_exists():
+            return
+        recientes = trazas.tramos()[-ULTIMOS:]
+        # Arranque e importaciones/pestañas medidas, incluidas las diferidas
+        lineas = [perfil_arranque.reporte(), "", trazas.texto_resumen(), "",
+                  f"Últimos {len(recientes)} tramos:"]
+        for nombre, categoria, _, duracion, _, args in reversed(recientes):
+            extra = "  " + ", ".join(f"{k}={v}" for k, v in args.items()) if args else ""
+            lineas.append(f"  {duracion / 1e6:10.2f} ms  [{categoria}] {nombre}{extra}")
+        texto.delete("1.0", "end")
+        texto.insert("1.0", "\n".join(lineas))
+        estado_label.configure(text=f"{len(trazas.tramos())}/{trazas.CAPACIDAD} tramos en el anillo")
+        ventana.after(INTERVALO_MS, refrescar)
+
+    def exportar():
+        path = filedialog.asksaveasfilename(parent=ventana, title="Exportar traza",
+                                            defaultextension=".json", initialfile="traza.json",
+                                            filetypes=[("Traza de Chrome", "*.json")])
+        if path:
+            print(f"Traza exportada en '{trazas.exportar_chrome(path)}'")
+
+    botones = ctk.CTkFrame(ventana, fg_color="transparent")
+    botones.pack(fill="x", padx=10, pady=(4, 10))
+    ctk.CTkButton(botones, text="Limpiar", command=trazas.limpiar).pack(side="left", padx=4)
+    ctk.CTkButton(botones, text="Exportar traza (Chrome)", command=exportar).pack(side="left", padx=4)
+
+    refrescar()
+    return ventana
@@ -0,0 +1,90 @@
+import customtkinter as ctk
+import os
+from tkinter import ttk
+
+# (clave, encabezado, ancho, formato)
+COLUMNAS = [
+    ("archivo", "Archivo", 220, "{}"),
+    ("duracion", "Duración (s)", 90, "{:.2f}"),
+    ("fs", "Fs (Hz)", 80, "{:.0f}"),
+    ("num_muestras", "Muestras", 80, "{:d}"),
+    ("v_min", "Mín (V)", 70, "{:.3f}"),
+    ("v_max", "Máx (V)", 70, "{:.3f}"),
+    ("rms", "RMS (V)", 70, "{:.3f}"),
+    ("f_dominante", "F dom. (Hz)", 90, "{:.1f}"),
+]
+
+def create_tabla_senales(parent, filas, al_seleccionar):
+    # filas: dicts de core.basedatos.senales_detalle; al_seleccionar(archivo)
+    frame = ctk.CTkFrame(parent, fg_color="transparent")
+
+    # customtkinter ignora placeholder_text si hay textvariable: se usa una etiqueta
+    filtro_frame = ctk.CTkFrame(frame, fg_color="transparent")
+    filtro_frame.pack(fill="x", pady=(0, 4))
+    ctk.CTkLabel(filtro_frame, text="Filtrar por archivo:").pack(side="left", padx=(0, 6))
+    filtro_var = ctk.StringVar()
+    ctk.CTkEntry(filtro_frame, textvariable=filtro_var).pack(side="left", fill="x", expand=True)
+
+    tabla_frame = ctk.CTkFrame(frame, fg_color="transparent")
+    tabla_frame.pack(fill="both", expand=True)
+
+    claves = [c[0] for c in COLUMNAS]
+    tabla = ttk.Treeview(tabla_frame, columns=claves, show="headings", height=6, selectmode="browse")
+    scroll = ttk.Scrollbar(tabla_frame, orient="vertical", command=tabla.yview)
+    tabla.configure(yscrollcommand=scroll.set)
+    scroll.pack(side="right", fill="y")
+    tabla.pack(side="left", fill="both", expand=True)
+
+    orden = {"clave": None, "descendente": False}
+    por_item = {}
+
+    def formato(fila, clave, fmt):
+        valor = fila.get(clave)
+        if valor is None:
+            return "—"
+        if clave == "archivo":
+            return os.path.basename(valor)
+        return fmt.format(valor)
+
+    def clave_orden(fila):
+        valor = fila[orden["clave"]]
+        return os.path.basename(valor).lower() if orden["clave"] == "archivo" else valor
+
+    def refrescar(*_):
+        texto = filtro_var.get().strip().lower()
+        visibles = [f for f in filas if texto in os.path.basename(f["archivo"]).lower()]
+        if orden["clave"] is not None:
+            # Los valores desconocidos van siempre al final
+            conocidas = [f for f in visibles if f.get(orden["clave"]) is not None]
+            desconocidas = [f for f in visibles if f.get(orden["clave"]) is None]
+            visibles = sorted(conocidas, key=clave_orden, reverse=orden["descendente"]) + desconocidas
+
+        tabla.delete(*tabla.get_children())
+        por_item.clear()
+        for fila in visibles:
+            item = tabla.insert("", "end", values=[formato(fila, c, fmt) for c, _, _, fmt in COLUMNAS])
+            por_item[item] = fila["archivo"]
+
+    def ordenar(clave):
+        if orden["clave"] == clave:
+            orden["descendente"] = not orden["descendente"]
+        else:
+            orden["clave"], orden["descendente"] = clave, False
+        for c, encabezado, _, _ in COLUMNAS:
+            flecha = (" ▼" if orden["descendente"] else " ▲") if c == clave else ""
+            tabla.heading(c, text=encabezado + flecha)
+        refrescar()
+
+    for clave, encabezado, ancho, _ in COLUMNAS:
+        tabla.heading(clave, text=encabezado, command=lambda c=clave: ordenar(c))
+        tabla.column(clave, width=ancho, anchor="w" if clave == "archivo" else "e", stretch=clave == "archivo")
+
+    def seleccionar(event):
+        seleccion = tabla.selection()
+        if seleccion:
+            al_seleccionar(por_item[seleccion[0]])
+
+    tabla.bind("<<TreeviewSelect>>", seleccionar)
+    filtro_var.trace_add("write", refrescar)
+    refrescar()
+    return frame
@@ -1,6 +1,11 @@
 import customtkinter as ctk
 import os, sys, threading
 from core.adquirircsv import adquirir_csv
+from core.adc_spi import adquirir_bloques
+from core.adquisicion_stream import AdquisicionStream
+from core.fuentes_adc import crear_fuente
+from core.formato_bin import EXTENSION
+from gui.osciloscopio import create_osciloscopio
 
 def TabAdquisicion(parent):
     frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -18,11 +23,20 @@ def TabAdquisicion(parent):
         def flush(self):
             pass
 
-    # Caja de logs
-    log_box = ctk.CTkTextbox(frame, width=580, height=350)
-    log_box.pack(padx=10, pady=10)
+    sesion = {"stream": None, "clasificador": None}
+
+    # Caja de logs y vista en vivo lado a lado
+    superior = ctk.CTkFrame(frame, fg_color="transparent")
+    superior.pack(fill="x", padx=10, pady=10)
+
+    log_box = ctk.CTkTextbox(superior, width=580, height=350)
+    log_box.pack(side="left", padx=10)
     sys.stdout = RedirectText(log_box)
 
+    # La vista lee del buffer circular del modo continuo
+    scope = create_osciloscopio(superior, lambda: sesion["stream"])
+    scope.pack(side="left", fill="both", expand=True, padx=10)
+
     # Cantidad de muestras
     label_muestras = ctk.CTkLabel(frame, text="Cantidad de muestras:")
     label_muestras.pack(pady=(10, 0))
@@ -43,11 +57,66 @@ def TabAdquisicion(parent):
 
     entry_nombre = ctk.CTkEntry(frame, width=400, placeholder_text="Ej: datos_sesion")
     entry_nombre.pack(pady=5)
+
+    # Formato de guardado (binario compacto o CSV de texto)
+    formatos = {f"Binario ({EXTENSION})": EXTENSION, "CSV (.csv)": ".csv"}
+    label_formato = ctk.CTkLabel(frame, text="Formato de guardado:")
+    label_formato.pack(pady=(10, 0))
+
+    option_formato = ctk.CTkOptionMenu(frame, values=list(formatos), width=200)
+    option_formato.set(f"Binario ({EXTENSION})")
+    option_formato.pack(pady=5)
+
+    # Motor de adquisición: lectura por muestra (gpiozero), lotes SPI directos
+    # o una fuente simulada para probar sin la Raspberry
+    motores = {"SPI por bloques": "spi", "gpiozero (muestra a muestra)": "gpiozero",
+               "Simulado (señal sintética)": "simulada"}
+    label_motor = ctk.CTkLabel(frame, text="Motor de adquisición:")
+    label_motor.pack(pady=(10, 0))
+
+    option_motor = ctk.CTkOptionMenu(frame, values=list(motores), width=200)
+    option_motor.set("SPI por bloques")
+    option_motor.pack(pady=5)
+
+    # Modo continuo: buffer circular + escritura por chunks, sin límite de duración
+    continuo_var = ctk.BooleanVar(value=False)
+    ctk.CTkCheckBox(frame, text="Modo continuo (guardado por bloques, sin límite)",
+                    variable=continuo_var).pack(pady=5)
+
+    # Clasificación por ventanas deslizantes mientras dura el modo continuo
+    clasificar_var = ctk.BooleanVar(value=False)
+    ctk.CTkCheckBox(frame, text="Clasificar en vivo (Healthy/COPD)",
+                    variable=clasificar_var).pack(pady=5)
+    label_clasificacion = ctk.CTkLabel(frame, text="")
+    label_clasificacion.pack()
+    barra_copd = ctk.CTkProgressBar(frame, width=300)
+    barra_copd.set(0)
+
+    def actualizar_clasificacion():
+        clasificador = sesion["clasificador"]
+        if clasificador is None:
+            return
+        estado = clasificador.ultimo
+        if estado["prob_copd"] is None:
+            label_clasificacion.configure(text="Clasificación en vivo: acumulando ventana...")
+        else:
+            barra_copd.set(estado["prob_copd"])
+            label_clasificacion.configure(
+                text=f"{estado['etiqueta']}  P(COPD) = {estado['prob_copd']:.2f}"
+                     f"  ({estado['ventanas']} ventanas, retraso {estado['retraso_s']:.1f} s)")
+        if clasificador.activo and frame.winfo_exists():
+            frame.after(250, actualizar_clasificacion)
     
     # Para adquirir
     def ejecutar():
+        if sesion["stream"] and sesion["stream"].activa:
+            print("Ya hay una adquisición continua en curso.")
+            return
+
+        texto = entry_muestras.get().strip()
         try:
-            cantidad = int(entry_muestras.get())
+            # En modo continuo la cantidad es opcional
+            cantidad = int(texto) if texto or not continuo_var.get() else 0
         except ValueError:
             print("Ingrese un número válido para las muestras.")
             return
@@ -56,10 +125,29 @@ def TabAdquisicion(parent):
         ruta = entry_path.get().strip()
 
         if ruta and nombre:
-            archivo = os.path.join(ruta, nombre + ".csv")
+            archivo = os.path.join(ruta, nombre + formatos[option_formato.get()])
+
+            if continuo_var.get():
+                # El stream maneja sus propios hilos de lectura y escritura
+                fuente = crear_fuente(motores[option_motor.get()])
+                sesion["stream"] = AdquisicionStream(archivo, cantidad, fuente).iniciar()
+                if clasificar_var.get():
+                    # Importa librosa y el modelo solo si se pide la clasificación
+                    from core.clasificador_stream import ClasificadorStream
+                    sesion["clasificador"] = ClasificadorStream(sesion["stream"]).iniciar()
+                    barra_copd.pack(pady=(0, 5))
+                    actualizar_clasificacion()
+                print(f"Archivo guardado en: {archivo}")
+                return
+
+            fuente = crear_fuente(motores[option_motor.get()])
+            if fuente.por_lotes:
+                adquirir = lambda: adquirir_bloques(cantidad, archivo, lector=fuente)
+            else:
+                adquirir = lambda: adquirir_csv(cantidad, archivo, fuente)
 
             # Hilo para no congelar la GUI
-            hilo = threading.Thread(target=lambda: adquirir_csv(cantidad, archivo))
+            hilo = threading.Thread(target=adquirir)
             hilo.start()
 
             print(f"Archivo guardado en: {archivo}")
@@ -68,6 +156,16 @@ def TabAdquisicion(parent):
 
     # Botón de iniciar
     btn = ctk.CTkButton(frame, text="Iniciar adquisición", command=ejecutar)
-    btn.pack(pady=20)
+    btn.pack(pady=(20, 4))
+
+    def detener():
+        if sesion["stream"] and sesion["stream"].activa:
+            sesion["stream"].detener()
+            if sesion["clasificador"]:
+                sesion["clasificador"].detener()
+            print("Deteniendo adquisición continua...")
+
+    btn_detener = ctk.CTkButton(frame, text="Detener", command=detener)
+    btn_detener.pack(pady=(4, 20))
 
     return frame
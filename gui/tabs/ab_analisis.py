@@ -1,8 +1,19 @@
 import customtkinter as ctk
 import os
 from tkinter import filedialog
+import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from core import cargar_graficar_csv, fft_csv, dwt_csv, csv_to_wav
+from core import cargar_graficar_csv, fft_csv, dwt_csv, csv_to_wav, espectrograma
+from core.cargar_senal import cargar_senal, Senal
+from core.formato_bin import es_binario, abrir_bin
+from core.vista_previa import vista_previa
+from core.remuestreo import senal_uniforme
+from core import sesion
+from gui.trabajos import GestorTrabajos
+from utils import trazas
+
+# Refresco del cursor de reproducción sobre la gráfica original
+INTERVALO_CURSOR_MS = 50
 
 def TabAnalisis(parent):
     frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -11,64 +22,239 @@ def TabAnalisis(parent):
     def select_file():
         file_path = filedialog.askopenfilename(
             title="Seleccionar archivo",
-            filetypes=[("Archivos de señal", "*.txt *.csv *.dat"), ("Todos", "*.*")]
+            filetypes=[("Archivos de señal", "*.txt *.csv *.dat *.ausc"), ("Todos", "*.*")]
         )
         if file_path:
+            cerrar_audio()
             selected_file["path"] = file_path
             file_label.configure(text=os.path.basename(file_path))
             status_label.configure(text=f"Archivo seleccionado: {os.path.basename(file_path)}")
 
+    trabajos = GestorTrabajos(frame)
+    figures = {"g1": None, "g2": None}
+    canvases = {"g1": None, "g2": None, "toolbar_g1": None}
+    # Señal que muestra la gráfica original (para ubicar el cursor de audio)
+    mostrada = {"g1": None}
+    audio = {"reproductor": None, "path": None, "t0": 0.0, "cursor": None, "after": None}
+
+    def embed(fig, placeholder, key):
+        for widget in placeholder.winfo_children():
+            widget.destroy()
+        # Liberar la figura anterior para que pyplot no las acumule
+        if figures[key] is not None:
+            plt.close(figures[key])
+        figures[key] = fig
+
+        canvas = FigureCanvasTkAgg(fig, master=placeholder)
+        with trazas.tramo("canvas.draw", "dibujo", grafica=key):
+            canvas.draw()
+        canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+        toolbar = NavigationToolbar2Tk(canvas, placeholder)
+        toolbar.update()
+        toolbar.pack(side="top", fill="x")
+        canvases[key] = canvas
+        if key == "g1":
+            canvases["toolbar_g1"] = toolbar
+            audio["cursor"] = None
+            canvas.mpl_connect("button_press_event", buscar_en_grafica)
+
+    def wavelet_params():
+        return {"nivel": int(nivel_var.get()), "banda": int(banda_var.get()),
+                "sin_ruido": denoise_var.get()}
+
+    def second_figure(method, datos):
+        if method == "fft":
+            return fft_csv.figura_fft(*datos)
+        if method == "espectrograma":
+            return espectrograma.figura_espectrograma(*datos)
+        return dwt_csv.figura_wavelet(datos)
+
+    def show_progress(fraccion, texto):
+        progress_bar.set(fraccion)
+        status_label.configure(text=texto)
+
+    def finish(texto):
+        progress_bar.set(0)
+        btn_cancel.configure(state="disabled")
+        status_label.configure(text=texto)
+
     def run_both_graphs():
         if not selected_file["path"]:
             status_label.configure(text="Error: seleccione un archivo primero")
             return
 
-        try:
-            # Limpiar placeholders
-            for widget in g1_placeholder.winfo_children():
-                widget.destroy()
-            for widget in g2_placeholder.winfo_children():
-                widget.destroy()
-
-            # Gráfica original
-            fig1 = cargar_graficar_csv.plot_g1(selected_file["path"])
-            canvas1 = FigureCanvasTkAgg(fig1, master=g1_placeholder)
-            canvas1.draw()
-            canvas1.get_tk_widget().pack(side="top", fill="both", expand=True)
-            toolbar1 = NavigationToolbar2Tk(canvas1, g1_placeholder)
-            toolbar1.update()
-            toolbar1.pack(side="top", fill="x")
-
-            # FFT o Wavelet
-            method = method_var.get()
+        # Los parámetros se leen aquí: las variables de Tk no se tocan desde el hilo de trabajo
+        path = selected_file["path"]
+        method = method_var.get()
+        metodo_fft = metodos_fft[fft_var.get()]
+        params = wavelet_params()
+
+        def tarea(trabajo):
+            # Carga y DSP fuera del hilo de Tk
+            trabajo.progreso(0.1, "Cargando señal...")
+            if method == "espectrograma" and es_binario(path):
+                # Registro .ausc: la STFT se lee por tramos del memmap y la gráfica
+                # original sale de la envolvente mín/máx, sin cargar el registro
+                # completo (puede no caber en memoria). No queda señal para
+                # clasificar: se retira la del archivo anterior
+                sesion.publicar(sesion.ANALISIS, None)
+                tiempo, voltios = vista_previa(path)
+                senal = Senal(tiempo, voltios, abrir_bin(path).fs, os.path.abspath(path))
+                trabajo.progreso(0.4, "Procesando señal...")
+                return senal, method, espectrograma.espectrograma(path)
+
+            senal = cargar_senal(path)
+            # Para clasificar se publica la versión en rejilla uniforme (queda en caché
+            # y la reutilizan FFT, wavelet y espectrograma)
+            sesion.publicar(sesion.ANALISIS, senal_uniforme(path))
+
+            # FFT, Espectrograma o Wavelet
+            trabajo.progreso(0.4, "Procesando señal...")
             if method == "fft":
-                fig2 = fft_csv.plot_fft(selected_file["path"])
+                datos = fft_csv.calcular_fft(path, metodo_fft)
+            elif method == "espectrograma":
+                datos = espectrograma.espectrograma(path)
             else:
-                fig2 = dwt_csv.plot_wavelet(selected_file["path"])
+                datos = dwt_csv.calcular_wavelet(path, **params)
 
-            canvas2 = FigureCanvasTkAgg(fig2, master=g2_placeholder)
-            canvas2.draw()
-            canvas2.get_tk_widget().pack(side="top", fill="both", expand=True)
-            toolbar2 = NavigationToolbar2Tk(canvas2, g2_placeholder)
-            toolbar2.update()
-            toolbar2.pack(side="top", fill="x")
+            trabajo.progreso(0.8, "Dibujando gráficas...")
+            return senal, method, datos
 
-            status_label.configure(text="Gráficas interactivas incrustadas")
+        def mostrar(resultado):
+            senal, method, datos = resultado
+            try:
+                # Gráfica original
+                embed(cargar_graficar_csv.figura_g1(senal), g1_placeholder, "g1")
+                mostrada["g1"] = senal.path
+                embed(second_figure(method, datos), g2_placeholder, "g2")
+                finish("Gráficas interactivas incrustadas")
+            except Exception as e:
+                finish(f"Error al generar gráficas: {e}")
 
-        except Exception as e:
-            status_label.configure(text=f"Error al generar gráficas: {e}")
+        # Un análisis nuevo reemplaza al que siga en curso
+        trabajos.enviar(tarea, mostrar, al_progreso=show_progress, clave="analisis",
+                        al_error=lambda e: finish(f"Error al generar gráficas: {e}"))
+        btn_cancel.configure(state="normal")
+        show_progress(0.05, "Iniciando análisis...")
 
+    def cancel_analysis():
+        trabajos.cancelar("analisis")
+        finish("Análisis cancelado")
+
+    def update_wavelet(*_):
+        # Cambiar nivel, banda o umbralizado reutiliza la descomposición en caché
+        if method_var.get() != "wavelet" or not selected_file["path"]:
+            return
+        path = selected_file["path"]
+        params = wavelet_params()
+        trabajos.enviar(lambda trabajo: dwt_csv.calcular_wavelet(path, **params),
+                        lambda datos: embed(dwt_csv.figura_wavelet(datos), g2_placeholder, "g2"),
+                        al_error=lambda e: status_label.configure(text=f"Error al generar gráficas: {e}"),
+                        clave="wavelet")
+
+    # Reproducción en el proceso, desde la señal en memoria y a su Fs real
     def play_signal():
         if not selected_file["path"]:
             status_label.configure(text="Error: seleccione un archivo primero")
             return
 
+        path = selected_file["path"]
+        if audio["reproductor"] is not None and audio["path"] == path:
+            audio["reproductor"].alternar()
+            seguir_cursor()
+            return
+
+        cerrar_audio()
+
+        def tarea(trabajo):
+            # Carga, normalización y remuestreo fuera del hilo de Tk. Se suena
+            # la señal regularizada, pero la gráfica del cursor es la original
+            original = cargar_senal(path)
+            senal = senal_uniforme(path)
+            try:
+                from core.reproductor import preparar
+                return ("stream", path, original) + preparar(senal.voltios, senal.fs)
+            except (ImportError, OSError, RuntimeError) as e:
+                # Sin sounddevice/PortAudio o sin una tasa admitida por el
+                # dispositivo: WAV y reproductor externo, como antes
+                print(f"Reproducción en el proceso no disponible ({e}); se usa un reproductor externo.")
+                return ("wav", path, csv_to_wav.csv_to_wav(path))
+
+        trabajos.enviar(tarea, iniciar_audio, clave="audio",
+                        al_error=lambda e: status_label.configure(text=f"Error al reproducir: {e}"))
+
+    def iniciar_audio(resultado):
+        modo, path = resultado[:2]
+        if modo == "wav":
+            csv_to_wav.play_wav(resultado[2])
+            status_label.configure(text=f"Reproduciendo señal: {os.path.basename(resultado[2])}")
+            return
+
+        original, datos_audio, fs_salida = resultado[2:]
+        from core.reproductor import Reproductor
         try:
-            wav_file = csv_to_wav.csv_to_wav(selected_file["path"])
-            csv_to_wav.play_wav(wav_file)
-            status_label.configure(text=f"Reproduciendo señal: {os.path.basename(wav_file)}")
+            # En el hilo de Tk solo se abre el stream
+            reproductor = Reproductor(datos_audio, fs_salida)
         except Exception as e:
             status_label.configure(text=f"Error al reproducir: {e}")
+            return
+
+        audio.update(reproductor=reproductor, path=path,
+                     t0=float(original.tiempo[0]) if len(original.tiempo) else 0.0)
+        # El cursor se dibuja sobre la gráfica original de esta señal
+        if mostrada["g1"] != original.path:
+            embed(cargar_graficar_csv.figura_g1(original), g1_placeholder, "g1")
+            mostrada["g1"] = original.path
+        reproductor.reproducir()
+        seguir_cursor()
+
+    def mover_cursor(x):
+        if figures["g1"] is None or canvases["g1"] is None:
+            return
+        if audio["cursor"] is None:
+            audio["cursor"] = figures["g1"].axes[0].axvline(x, color="k", linewidth=1)
+        else:
+            audio["cursor"].set_xdata([x, x])
+        canvases["g1"].draw_idle()
+
+    def seguir_cursor():
+        # Un solo ciclo de refresco aunque se llame de nuevo al buscar o reanudar
+        if audio["after"] is not None:
+            frame.after_cancel(audio["after"])
+            audio["after"] = None
+        reproductor = audio["reproductor"]
+        if reproductor is None or not frame.winfo_exists():
+            return
+        mover_cursor(audio["t0"] + reproductor.posicion)
+        btn_audio.configure(text="Pausar" if reproductor.estado == "reproduciendo" else "Escuchar señal")
+        status_label.configure(text=f"Audio {reproductor.estado}: {reproductor.posicion:.1f} / "
+                                    f"{reproductor.duracion:.1f} s ({reproductor.fs_salida} Hz)")
+        if reproductor.estado == "reproduciendo":
+            audio["after"] = frame.after(INTERVALO_CURSOR_MS, seguir_cursor)
+
+    def buscar_en_grafica(event):
+        # Clic sobre la gráfica original: salta a ese instante (salvo con zoom o desplazamiento activos)
+        toolbar = canvases["toolbar_g1"]
+        if audio["reproductor"] is None or event.inaxes is None or (toolbar and toolbar.mode):
+            return
+        if mostrada["g1"] != os.path.abspath(audio["path"]):
+            return
+        audio["reproductor"].buscar(event.xdata - audio["t0"])
+        seguir_cursor()
+
+    def stop_signal():
+        if audio["reproductor"] is not None:
+            audio["reproductor"].detener()
+            seguir_cursor()
+
+    def cerrar_audio():
+        if audio["reproductor"] is not None:
+            audio["reproductor"].cerrar()
+            if audio["cursor"] is not None:
+                audio["cursor"].remove()
+                canvases["g1"].draw_idle()
+        audio.update(reproductor=None, path=None, cursor=None)
+        btn_audio.configure(text="Escuchar señal")
 
     main_frame = ctk.CTkFrame(frame, fg_color="transparent")
     main_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -97,14 +283,45 @@ def TabAnalisis(parent):
 
     method_var = ctk.StringVar(value="fft")
     ctk.CTkRadioButton(controls_frame, text="FFT", variable=method_var, value="fft").pack(pady=4, fill="x")
+    # Cálculo del espectro: automático usa Welch en registros largos
+    metodos_fft = {"Espectro automático": "auto", "FFT completa": "fft", "Welch (promediado)": "welch"}
+    fft_var = ctk.StringVar(value="Espectro automático")
+    ctk.CTkOptionMenu(controls_frame, values=list(metodos_fft), variable=fft_var).pack(pady=4, fill="x")
     ctk.CTkRadioButton(controls_frame, text="Wavelet", variable=method_var, value="wavelet").pack(pady=4, fill="x")
+    ctk.CTkRadioButton(controls_frame, text="Espectrograma", variable=method_var, value="espectrograma").pack(pady=4, fill="x")
+
+    # Opciones de la descomposición wavelet
+    niveles = [str(n) for n in range(1, dwt_csv.NIVEL_MAX + 1)]
+    wavelet_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
+    wavelet_frame.pack(pady=4, fill="x")
+    ctk.CTkLabel(wavelet_frame, text="Nivel").grid(row=0, column=0, sticky="w")
+    nivel_var = ctk.StringVar(value="1")
+    ctk.CTkOptionMenu(wavelet_frame, values=niveles, variable=nivel_var, width=70,
+                      command=update_wavelet).grid(row=0, column=1, padx=4, pady=2)
+    ctk.CTkLabel(wavelet_frame, text="Banda D").grid(row=1, column=0, sticky="w")
+    banda_var = ctk.StringVar(value="1")
+    ctk.CTkOptionMenu(wavelet_frame, values=niveles, variable=banda_var, width=70,
+                      command=update_wavelet).grid(row=1, column=1, padx=4, pady=2)
+    denoise_var = ctk.BooleanVar(value=False)
+    ctk.CTkCheckBox(wavelet_frame, text="Eliminar ruido", variable=denoise_var,
+                    command=update_wavelet).grid(row=2, column=0, columnspan=2, sticky="w", pady=2)
 
     btn_run = ctk.CTkButton(controls_frame, text="Iniciar", command=run_both_graphs)
     btn_run.pack(pady=4, fill="x")
 
+    btn_cancel = ctk.CTkButton(controls_frame, text="Cancelar análisis", command=cancel_analysis, state="disabled")
+    btn_cancel.pack(pady=4, fill="x")
+
+    progress_bar = ctk.CTkProgressBar(controls_frame)
+    progress_bar.set(0)
+    progress_bar.pack(pady=4, fill="x")
+
     btn_audio = ctk.CTkButton(controls_frame, text="Escuchar señal", command=play_signal)
     btn_audio.pack(pady=4, fill="x")
 
+    btn_stop = ctk.CTkButton(controls_frame, text="Detener audio", command=stop_signal)
+    btn_stop.pack(pady=4, fill="x")
+
     status_label = ctk.CTkLabel(controls_frame, text="Seleccione un archivo para comenzar", text_color="#333333")
     status_label.pack(pady=10, fill="x")
 
@@ -1,13 +1,26 @@
 import customtkinter as ctk
-import sqlite3, os
-from tkinter import filedialog
+import os
+from tkinter import filedialog, ttk
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from core import cargar_graficar_csv
+from core.basedatos import obtener_bd
+from core.cargar_senal import cargar_senal
+from core.metadatos import calcular_metadatos
+from core.vista_previa import vista_previa, generar as generar_previews
+from gui.trabajos import GestorTrabajos
+from utils import trazas
+from gui.tabla_senales import create_tabla_senales
+
+# Espera tras la última tecla antes de buscar
+DEBOUNCE_MS = 300
 
 def TabRegistro(parent):
     frame = ctk.CTkFrame(parent, fg_color="transparent")
-    base_dir  = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    db_path = os.path.join(base_dir, "data", "usuarios.db")
+    # Las consultas corren en el hilo de la base de datos; el gestor entrega
+    # los resultados al hilo de Tk
+    trabajos = GestorTrabajos(frame, max_hilos=2)
 
     # Para limpiar los frames d la ventana
     def clear_frame_safe(f):
@@ -45,7 +58,7 @@ def TabRegistro(parent):
     def select_signals():
         files = filedialog.askopenfilenames(
             title="Seleccionar señales",
-            filetypes=[("Archivos de señal", "*.csv *.txt *.dat"), ("Todos", "*.*")]
+            filetypes=[("Archivos de señal", "*.csv *.txt *.dat *.ausc"), ("Todos", "*.*")]
         )
         if files:
             selected_signals.clear()
@@ -60,7 +73,8 @@ def TabRegistro(parent):
             try:
                 fig = cargar_graficar_csv.plot_g1(archivo)
                 canvas = FigureCanvasTkAgg(fig, master=preview_frame)
-                canvas.draw()
+                with trazas.tramo("canvas.draw", "dibujo", grafica="seleccion"):
+                    canvas.draw()
                 canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
 
                 toolbar = NavigationToolbar2Tk(canvas, preview_frame)
@@ -86,51 +100,38 @@ def TabRegistro(parent):
             status_label.configure(text="Error: complete todos los campos y seleccione señales")
             return
 
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS registro (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nit INTEGER,
-                    nombre TEXT,
-                    apellido TEXT,
-                    edad INTEGER,
-                    correo TEXT
-                )
-            """)
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS señales (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nit TEXT,
-                    archivo TEXT,
-                    FOREIGN KEY (nit) REFERENCES registro(nit)
-                )
-            """)
-
-            cursor.execute("SELECT nit FROM registro WHERE nit = ?", (nit,))
-            existe = cursor.fetchone()
-
-            if not existe:
-                cursor.execute("INSERT INTO registro (nit, nombre, apellido, edad, correo) VALUES (?, ?, ?, ?, ?)",
-                               (nit, nombre, apellido, edad, correo))
-
-            for archivo in selected_signals:
-                cursor.execute("INSERT INTO señales (nit, archivo) VALUES (?, ?)", (nit, archivo))
-
-            conn.commit()
-            conn.close()
-            status_label.configure(text="Datos guardados correctamente")
+        archivos = list(selected_signals)
+        status_label.configure(text="Guardando...")
+
+        def guardado(nuevo):
+            texto = "Datos guardados correctamente" if nuevo else "Señales agregadas a un usuario existente"
+            status_label.configure(text=texto)
 
+        def guardar(trabajo):
+            # Resumen de cada señal calculado una sola vez, al registrarla
+            metadatos = []
+            for i, archivo in enumerate(archivos):
+                trabajo.progreso(i / len(archivos), f"Analizando {os.path.basename(archivo)}...")
+                metadatos.append(metadatos_o_none(archivo))
+            generar_previews(archivos)
+            return obtener_bd().guardar_usuario(nit, nombre, apellido, edad, correo, archivos, metadatos)
+
+        trabajos.enviar(guardar, guardado,
+                        al_progreso=lambda fraccion, texto: status_label.configure(text=texto),
+                        al_error=lambda e: status_label.configure(text=f"Error al guardar: {e}"))
+
+    def metadatos_o_none(archivo):
+        # Un archivo ilegible se registra igual, sin resumen
+        try:
+            return calcular_metadatos(archivo)
         except Exception as e:
-            status_label.configure(text=f"Error al guardar: {e}")
+            print(f"No se pudieron calcular los metadatos de {archivo}: {e}")
+            return None
 
     ctk.CTkButton(form_frame, text="Guardar en base de datos", command=save_to_db).pack(pady=10, fill="x")
 
     # Para buscar en la base de datos input
-    entry_search_nit = ctk.CTkEntry(form_frame, placeholder_text="Buscar por NIT")
+    entry_search_nit = ctk.CTkEntry(form_frame, placeholder_text="Buscar por NIT, nombre o apellido")
     entry_search_nit.pack(pady=4, fill="x")
 
     # Vista frame derecho
@@ -148,65 +149,206 @@ def TabRegistro(parent):
     graph_frame = ctk.CTkFrame(preview_frame, fg_color="transparent")
     graph_frame.pack(fill="both", expand=True, pady=6)
 
-    # Buscar en lña base de datos
-    def search_by_nit():
-        nit = entry_search_nit.get()
-        if not nit:
-            status_label.configure(text="Ingrese un NIT para buscar")
-            return
-
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT nombre, apellido, edad, correo FROM registro WHERE nit = ?", (nit,))
-            usuario = cursor.fetchone()
-
-            clear_frame_safe(user_info_frame)
-            clear_frame_safe(selector_frame)
-            clear_frame_safe(graph_frame)
-
-            if usuario:
-                nombre, apellido, edad, correo = usuario
-
-                ctk.CTkLabel(user_info_frame, text=f"Usuario: {nombre} {apellido}", font=(None, 14, "bold")).pack(anchor="w")
-                ctk.CTkLabel(user_info_frame, text=f"Edad: {edad}").pack(anchor="w")
-                ctk.CTkLabel(user_info_frame, text=f"Correo: {correo}").pack(anchor="w")
-
-                cursor.execute("SELECT archivo FROM señales WHERE nit = ?", (nit,))
-                archivos = [a[0] for a in cursor.fetchall()]
-
-                if archivos:
-                    def mostrar_señal(archivo):
-                        clear_frame_safe(graph_frame)
-                        try:
-                            fig = cargar_graficar_csv.plot_g1(archivo)
-                            canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-                            canvas.draw()
-                            canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
-
-                            toolbar = NavigationToolbar2Tk(canvas, graph_frame)
-                            toolbar.update()
-                            toolbar.pack(side="top", fill="x")
-                        except Exception as e:
-                            ctk.CTkLabel(graph_frame, text=f"Error al graficar {archivo}: {e}", text_color="red").pack()
-
-                    selector = ctk.CTkOptionMenu(selector_frame, values=archivos, command=mostrar_señal)
-                    selector.pack(fill="x", pady=4)
-
-                    mostrar_señal(archivos[0])
-                else:
-                    ctk.CTkLabel(graph_frame, text="No hay señales asociadas", text_color="red").pack()
+    # Búsqueda de pacientes por prefijo, paginada y con espera entre teclas
+    busqueda = {"texto": "", "pagina": 0, "pendiente": None}
+
+    def programar_busqueda(event=None):
+        if busqueda["pendiente"] is not None:
+            frame.after_cancel(busqueda["pendiente"])
+        busqueda["pendiente"] = frame.after(DEBOUNCE_MS, lambda: buscar_pacientes(0))
+
+    def buscar_pacientes(pagina):
+        busqueda["pendiente"] = None
+        texto = entry_search_nit.get().strip()
+        busqueda["texto"], busqueda["pagina"] = texto, pagina
+        trabajos.enviar(lambda trabajo: obtener_bd().buscar_pacientes(texto, pagina),
+                        mostrar_pacientes, clave="pacientes",
+                        al_error=lambda e: status_label.configure(text=f"Error en la búsqueda: {e}"))
+
+    def mostrar_pacientes(resultado):
+        filas, hay_mas = resultado
+        tabla_pacientes.delete(*tabla_pacientes.get_children())
+        for fila in filas:
+            tabla_pacientes.insert("", "end", iid=fila["nit"],
+                                   values=(fila["nit"], fila["nombre"], fila["apellido"]))
+        pagina = busqueda["pagina"]
+        label_pagina.configure(text=f"Página {pagina + 1}" if filas else "Sin resultados")
+        btn_anterior.configure(state="normal" if pagina > 0 else "disabled")
+        btn_siguiente.configure(state="normal" if hay_mas else "disabled")
+        # Un NIT escrito completo abre directamente al paciente
+        if busqueda["texto"] in tabla_pacientes.get_children():
+            tabla_pacientes.selection_set(busqueda["texto"])
+
+    def seleccionar_paciente(event):
+        seleccion = tabla_pacientes.selection()
+        if seleccion:
+            search_by_nit(seleccion[0])
+
+    def buscar_ahora(event=None):
+        if busqueda["pendiente"] is not None:
+            frame.after_cancel(busqueda["pendiente"])
+        buscar_pacientes(0)
 
+    # Buscar en lña base de datos
+    def search_by_nit(nit):
+        def consultar(trabajo):
+            bd = obtener_bd()
+            usuario = bd.buscar_usuario(nit)
+            if not usuario:
+                return None, []
+            senales = bd.senales_detalle(nit)
+
+            # Señales registradas antes de guardar metadatos: se completan una vez.
+            # Si el cálculo falla queda marcada y no se reintenta al abrir el paciente
+            pendientes = [s for s in senales if s["num_muestras"] is None and not s["sin_metadatos"]
+                          and os.path.exists(s["archivo"])]
+            calculados = []
+            for s in pendientes:
+                datos = metadatos_o_none(s["archivo"])
+                if datos:
+                    s.update(datos)
+                calculados.append((s["id"], datos))
+            if calculados:
+                bd.actualizar_metadatos(calculados)
+            return usuario, senales
+
+        trabajos.enviar(consultar, mostrar_usuario, clave="busqueda",
+                        al_error=lambda e: status_label.configure(text=f"Error en la búsqueda: {e}"))
+
+    # Figura de pyplot de la vista completa: se cierra al reemplazarla
+    figura_completa = {"fig": None}
+
+    def cerrar_completa():
+        if figura_completa["fig"] is not None:
+            plt.close(figura_completa["fig"])
+            figura_completa["fig"] = None
+
+    def crear_visor():
+        # Vista previa ligera (envolvente en caché) reutilizando una sola
+        # figura; la señal completa se carga solo con "Ver completa"
+        estado = {"archivo": None}
+
+        barra = ctk.CTkFrame(graph_frame, fg_color="transparent")
+        barra.pack(side="top", fill="x")
+        titulo = ctk.CTkLabel(barra, text="")
+        titulo.pack(side="left", padx=4)
+        ctk.CTkButton(barra, text="Ver completa", width=110,
+                      command=lambda: ver_completa()).pack(side="right", padx=4)
+
+        previa_frame = ctk.CTkFrame(graph_frame, fg_color="transparent")
+        previa_frame.pack(side="top", fill="both", expand=True)
+        completa_frame = ctk.CTkFrame(graph_frame, fg_color="transparent")
+
+        fig = Figure(figsize=(4, 2))
+        ax = fig.add_subplot()
+        linea, = ax.plot([], [], color='r', linewidth=0.5)
+        ax.set_xlabel('Tiempo (s)')
+        ax.set_ylabel('Voltios')
+        ax.set_ylim(-1.5, 1.5)
+        ax.grid(True)
+        fig.tight_layout()
+        canvas = FigureCanvasTkAgg(fig, master=previa_frame)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        def mostrar_previa():
+            completa_frame.pack_forget()
+            clear_frame_safe(completa_frame)
+            cerrar_completa()
+            previa_frame.pack(side="top", fill="both", expand=True)
+
+        def dibujar(resultado):
+            archivo, (tiempo, voltios) = resultado
+            mostrar_previa()
+            linea.set_data(tiempo, voltios)
+            if len(tiempo) > 1:
+                ax.set_xlim(tiempo[0], tiempo[-1])
+            titulo.configure(text=os.path.basename(archivo))
+            canvas.draw_idle()
+
+        def mostrar_señal(archivo):
+            estado["archivo"] = archivo
+            titulo.configure(text=f"Cargando {os.path.basename(archivo)}...")
+            trabajos.enviar(lambda trabajo: (archivo, vista_previa(archivo)), dibujar, clave="previa",
+                            al_error=lambda e: titulo.configure(text=f"Error al graficar {os.path.basename(archivo)}: {e}"))
+
+        def dibujar_completa(senal):
+            fig_completa = cargar_graficar_csv.figura_g1(senal)
+            previa_frame.pack_forget()
+            clear_frame_safe(completa_frame)
+            cerrar_completa()
+            figura_completa["fig"] = fig_completa
+
+            canvas_completa = FigureCanvasTkAgg(fig_completa, master=completa_frame)
+            with trazas.tramo("canvas.draw", "dibujo", grafica="completa"):
+                canvas_completa.draw()
+            canvas_completa.get_tk_widget().pack(side="top", fill="both", expand=True)
+            toolbar = NavigationToolbar2Tk(canvas_completa, completa_frame)
+            toolbar.update()
+            toolbar.pack(side="top", fill="x")
+            completa_frame.pack(side="top", fill="both", expand=True)
+            titulo.configure(text=os.path.basename(senal.path))
+
+        def ver_completa():
+            archivo = estado["archivo"]
+            if not archivo:
+                return
+            titulo.configure(text="Cargando señal completa...")
+            trabajos.enviar(lambda trabajo: cargar_senal(archivo), dibujar_completa, clave="previa",
+                            al_error=lambda e: titulo.configure(text=f"Error al graficar {os.path.basename(archivo)}: {e}"))
+
+        return mostrar_señal
+
+    def mostrar_usuario(resultado):
+        usuario, senales = resultado
+        cerrar_completa()
+        clear_frame_safe(user_info_frame)
+        clear_frame_safe(selector_frame)
+        clear_frame_safe(graph_frame)
+
+        if usuario:
+            ctk.CTkLabel(user_info_frame, text=f"Usuario: {usuario['nombre']} {usuario['apellido']}", font=(None, 14, "bold")).pack(anchor="w")
+            ctk.CTkLabel(user_info_frame, text=f"Edad: {usuario['edad']}").pack(anchor="w")
+            ctk.CTkLabel(user_info_frame, text=f"Correo: {usuario['correo']}").pack(anchor="w")
+
+            if senales:
+                mostrar_señal = crear_visor()
+                # Tabla ordenable y filtrable con el resumen de cada señal
+                tabla = create_tabla_senales(selector_frame, senales, mostrar_señal)
+                tabla.pack(fill="x", pady=4)
+
+                mostrar_señal(senales[0]["archivo"])
             else:
-                ctk.CTkLabel(graph_frame, text="NIT no encontrado", text_color="red").pack()
-
-            conn.close()
-
-        except Exception as e:
-            status_label.configure(text=f"Error en la búsqueda: {e}")
-
-    ctk.CTkButton(form_frame, text="Buscar", command=search_by_nit).pack(pady=4, fill="x")
+                ctk.CTkLabel(graph_frame, text="No hay señales asociadas", text_color="red").pack()
+
+        else:
+            ctk.CTkLabel(graph_frame, text="NIT no encontrado", text_color="red").pack()
+
+    ctk.CTkButton(form_frame, text="Buscar", command=buscar_ahora).pack(pady=4, fill="x")
+    entry_search_nit.bind("<KeyRelease>", programar_busqueda)
+    entry_search_nit.bind("<Return>", buscar_ahora)
+
+    # Resultados de la búsqueda
+    pacientes_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
+    pacientes_frame.pack(pady=4, fill="both", expand=True)
+    tabla_pacientes = ttk.Treeview(pacientes_frame, columns=("nit", "nombre", "apellido"),
+                                   show="headings", height=8, selectmode="browse")
+    for columna, encabezado, ancho in (("nit", "NIT", 90), ("nombre", "Nombre", 100), ("apellido", "Apellido", 100)):
+        tabla_pacientes.heading(columna, text=encabezado)
+        tabla_pacientes.column(columna, width=ancho)
+    tabla_pacientes.pack(fill="both", expand=True)
+    tabla_pacientes.bind("<<TreeviewSelect>>", seleccionar_paciente)
+
+    paginas_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
+    paginas_frame.pack(pady=2, fill="x")
+    btn_anterior = ctk.CTkButton(paginas_frame, text="<", width=40, state="disabled",
+                                 command=lambda: buscar_pacientes(busqueda["pagina"] - 1))
+    btn_anterior.pack(side="left")
+    btn_siguiente = ctk.CTkButton(paginas_frame, text=">", width=40, state="disabled",
+                                  command=lambda: buscar_pacientes(busqueda["pagina"] + 1))
+    btn_siguiente.pack(side="right")
+    label_pagina = ctk.CTkLabel(paginas_frame, text="")
+    label_pagina.pack(side="left", expand=True)
+    buscar_pacientes(0)
 
     status_label = ctk.CTkLabel(form_frame, text="Complete el formulario y seleccione señales", text_color="#333333")
     status_label.pack(pady=6, fill="x")
@@ -1,13 +1,13 @@
 import customtkinter as ctk
 from tkinter import filedialog
-import sounddevice as sd
-import soundfile as sf
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+import os
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from core.predict import predict_audio
-from core import cargar_graficar_csv, fft_csv, dwt_csv
+from core.predict import predict_audio, predict_carpeta, predict_senal
+from core import sesion
+from gui.trabajos import GestorTrabajos
+from utils import trazas
 
 def TabPrediccion(parent):
     frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -16,6 +16,7 @@ def TabPrediccion(parent):
     audio_path = {"path": None}
     user_choice = ctk.StringVar(value="Healthy")
     canvas_cm = {"widget": None}
+    gestor = GestorTrabajos(frame, max_hilos=1)
     main_frame = ctk.CTkFrame(frame, fg_color="transparent")
     main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
@@ -38,6 +39,9 @@ def TabPrediccion(parent):
         if not audio_path["path"]:
             label_resultado.configure(text="Selecciona un archivo primero")
             return
+        # Dependencias de audio pesadas: se importan al primer uso
+        import sounddevice as sd
+        import soundfile as sf
         data, fs = sf.read(audio_path["path"])
         sd.play(data, fs)
 
@@ -53,7 +57,51 @@ def TabPrediccion(parent):
             label_resultado.configure(text=f"Incorrecto: El modelo predijo {pred}")
         mostrar_matriz_confusion(user, pred)
 
+    def predecir_carpeta():
+        carpeta = filedialog.askdirectory()
+        if not carpeta:
+            return
+        label_resultado.configure(text="Clasificando carpeta...")
+        gestor.enviar(lambda trabajo: predict_carpeta(carpeta), mostrar_lote,
+                      al_error=lambda e: label_resultado.configure(text=f"Error: {e}"),
+                      clave="lote")
+
+    def predecir_en_memoria(clave, descripcion):
+        senal = sesion.obtener(clave)
+        if senal is None:
+            label_resultado.configure(text=f"No hay {descripcion} disponible")
+            return
+        user = user_choice.get()
+        label_resultado.configure(text=f"Clasificando {descripcion}...")
+
+        def mostrar(r):
+            texto = "Correcto" if r.etiqueta == user else "Incorrecto"
+            label_resultado.configure(
+                text=f"{texto}: El modelo predijo {r.etiqueta} (confianza {r.confianza:.2f})")
+            mostrar_matriz_confusion(user, r.etiqueta)
+
+        nombre = os.path.basename(senal.path) if senal.path else None
+        gestor.enviar(lambda trabajo: predict_senal(senal.voltios, senal.fs, nombre), mostrar,
+                      al_error=lambda e: label_resultado.configure(text=f"Error: {e}"),
+                      clave="memoria")
+
+    def mostrar_lote(resultados):
+        lineas = []
+        for r in resultados:
+            nombre = os.path.basename(r.archivo)
+            if r.error is not None:
+                lineas.append(f"{nombre}: error")
+            else:
+                lineas.append(f"{nombre}: {r.etiqueta} ({r.confianza:.2f})")
+        copd = sum(r.etiqueta == "COPD" for r in resultados)
+        label_resultado.configure(text=f"{len(resultados)} archivos, {copd} COPD")
+        lote_box.configure(state="normal")
+        lote_box.delete("1.0", "end")
+        lote_box.insert("end", "\n".join(lineas) or "No hay archivos .wav en la carpeta")
+        lote_box.configure(state="disabled")
+
     def mostrar_matriz_confusion(user, pred):
+        import seaborn as sns
         etiquetas = ["Healthy", "COPD"]
         cm = np.zeros((2, 2), dtype=int)
         cm[etiquetas.index(user), etiquetas.index(pred)] = 1
@@ -69,7 +117,8 @@ def TabPrediccion(parent):
         ax.set_title("Matriz de confusión (1 ejemplo)")
         # Incrustar en GUI
         canvas = FigureCanvasTkAgg(fig, master=cm_frame)
-        canvas.draw()
+        with trazas.tramo("canvas.draw", "dibujo", grafica="matriz"):
+            canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
         canvas_cm["widget"] = canvas
         
@@ -87,8 +136,17 @@ def TabPrediccion(parent):
     ctk.CTkRadioButton(left_frame, text="COPD", variable=user_choice, value="COPD").pack(anchor="w")
 
     ctk.CTkButton(left_frame, text="Iniciar predicción", command=iniciar_prediccion).pack(pady=20)
+    ctk.CTkButton(left_frame, text="Predecir carpeta", command=predecir_carpeta).pack(pady=5)
+    # Clasificación sin pasar por archivos WAV
+    ctk.CTkButton(left_frame, text="Clasificar última adquisición",
+                  command=lambda: predecir_en_memoria(sesion.ADQUISICION, "adquisición")).pack(pady=5)
+    ctk.CTkButton(left_frame, text="Clasificar señal de análisis",
+                  command=lambda: predecir_en_memoria(sesion.ANALISIS, "señal cargada")).pack(pady=5)
 
     label_resultado = ctk.CTkLabel(left_frame, text="", font=("Arial", 14))
     label_resultado.pack(pady=10)
 
+    lote_box = ctk.CTkTextbox(left_frame, width=220, height=150, state="disabled")
+    lote_box.pack(pady=5, fill="x")
+
     return frame
@@ -0,0 +1,110 @@
+import queue, threading
+from concurrent.futures import ThreadPoolExecutor
+from utils import trazas
+
+# Intervalo de sondeo de la cola de resultados desde el hilo de Tk
+INTERVALO_MS = 50
+
+class Cancelado(Exception):
+    pass
+
+class Trabajo:
+    def __init__(self, gestor, clave):
+        self.gestor = gestor
+        self.clave = clave
+        self._cancelado = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    def comprobar(self):
+        # Punto de cancelación entre etapas del trabajo
+        if self._cancelado.is_set():
+            raise Cancelado()
+
+    def progreso(self, fraccion, texto=""):
+        self.comprobar()
+        self.gestor._cola.put((self, "progreso", (fraccion, texto)))
+
+class GestorTrabajos:
+    # Ejecuta tareas en un pool de hilos y entrega los resultados en el hilo de
+    # Tk mediante una cola sondeada con after(). Un trabajo nuevo con la misma
+    # clave cancela y descarta al anterior.
+    def __init__(self, widget, max_hilos=2):
+        self.widget = widget
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos)
+        self._cola = queue.Queue()
+        self._actuales = {}
+        self._callbacks = {}
+        self._sondeando = False
+
+    def enviar(self, tarea, al_terminar, al_error=None, al_progreso=None, clave=None):
+        # tarea(trabajo) se ejecuta fuera del hilo de Tk; los callbacks, dentro
+        if clave is not None and clave in self._actuales:
+            self._actuales[clave].cancelar()
+
+        trabajo = Trabajo(self, clave)
+        if clave is not None:
+            self._actuales[clave] = trabajo
+        self._callbacks[trabajo] = (al_terminar, al_error, al_progreso)
+
+        def ejecutar():
+            try:
+                with trazas.tramo(f"trabajo:{clave or 'anonimo'}", "trabajo"):
+                    resultado = tarea(trabajo)
+                trabajo.comprobar()
+            except Cancelado:
+                self._cola.put((trabajo, "cancelado", None))
+            except Exception as e:
+                self._cola.put((trabajo, "error", e))
+            else:
+                self._cola.put((trabajo, "ok", resultado))
+
+        self._pool.submit(ejecutar)
+        if not self._sondeando:
+            self._sondeando = True
+            self.widget.after(INTERVALO_MS, self._sondear)
+        return trabajo
+
+    def cancelar(self, clave):
+        if clave in self._actuales:
+            self._actuales.pop(clave).cancelar()
+
+    def _vigente(self, trabajo):
+        return not trabajo.cancelado and (trabajo.clave is None
+                                         or self._actuales.get(trabajo.clave) is trabajo)
+
+    def _sondear(self):
+        while True:
+            try:
+                trabajo, tipo, valor = self._cola.get_nowait()
+            except queue.Empty:
+                break
+
+            al_terminar, al_error, al_progreso = self._callbacks.get(trabajo, (None, None, None))
+            vigente = self._vigente(trabajo)
+
+            if tipo == "progreso":
+                if vigente and al_progreso:
+                    al_progreso(*valor)
+                continue
+
+            # Resultados de trabajos reemplazados o cancelados se descartan
+            self._callbacks.pop(trabajo, None)
+            if trabajo.clave is not None and self._actuales.get(trabajo.clave) is trabajo:
+                del self._actuales[trabajo.clave]
+            if not vigente:
+                continue
+            if tipo == "ok":
+                al_terminar(valor)
+            elif tipo == "error" and al_error:
+                al_error(valor)
+
+        if self._callbacks and self.widget.winfo_exists():
+            self.widget.after(INTERVALO_MS, self._sondear)
+        else:
+            self._sondeando = False
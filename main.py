@@ -1,8 +1,15 @@
-import customtkinter as ctk
+from utils import perfil_arranque
+
+with perfil_arranque.medir("import", "customtkinter"):
+    import customtkinter as ctk
 from datetime import datetime
-from gui.content import get_tab_frame
-from utils.check_spi import check_spi
+with perfil_arranque.medir("import", "gui.content"):
+    from gui.content import get_tab_frame
+with perfil_arranque.medir("import", "utils.check_spi"):
+    from utils.check_spi import sondear_spi
+from utils.monitor_spi import MonitorSpi
 from gui.footer import create_footer
+from gui.panel_trazas import abrir_panel_trazas
 import os
 
 try:
@@ -70,16 +77,15 @@ def main():
         lbl_right = ctk.CTkLabel(header, text="[Sponsor]")
     lbl_right.grid(row=0, column=2, sticky="e")
 
-    # Pestañas (hacer que la vista de pestañas se expanda verticalmente)
-    tabview = ctk.CTkTabview(root, width=1000)
-    tabview.grid(row=1, column=0, sticky="nsew", padx=16, pady=(14, 0))
-    tab_names = ["Adquisición", "Análisis", "Registro", "Predicción", "Acerca de"]
-    for name in tab_names:
-        tabview.add(name)
-
     # Coloca el contenido de cada pestaña dentro de su propio marco de pestaña
-    # para que el tamaño se ajuste a la vista de pestañas.
-    for name in tab_names:
+    # para que el tamaño se ajuste a la vista de pestañas. Cada pestaña se
+    # construye la primera vez que se selecciona.
+    built_tabs = set()
+
+    def build_tab(name):
+        if name in built_tabs:
+            return
+        built_tabs.add(name)
         container = tabview.tab(name)
         # permitir que el contenedor se expanda
         try:
@@ -87,10 +93,29 @@ def main():
             container.grid_columnconfigure(0, weight=1)
         except Exception:
             pass
+        desde = perfil_arranque.marca()
         frame = get_tab_frame(container, name)
         frame.grid(row=0, column=0, sticky="nsew", padx=12, pady=8)
+        # Las pestañas que se construyen tras el arranque se reportan aparte
+        if perfil_arranque.arranque_terminado():
+            perfil_arranque.imprimir_reporte(desde)
+
+    # Pestañas (hacer que la vista de pestañas se expanda verticalmente)
+    tabview = ctk.CTkTabview(root, width=1000, command=lambda: build_tab(tabview.get()))
+    tabview.grid(row=1, column=0, sticky="nsew", padx=16, pady=(14, 0))
+    tab_names = ["Adquisición", "Análisis", "Registro", "Predicción", "Acerca de"]
+    for name in tab_names:
+        tabview.add(name)
+
+    # Solo la pestaña visible se construye al arrancar
+    build_tab(tabview.get())
 
-    create_footer(root, check_spi)
+    # El estado del dispositivo se sondea en segundo plano, fuera del hilo de Tk
+    monitor = MonitorSpi(sondear_spi).iniciar()
+    create_footer(root, monitor)
+    # Panel oculto con las trazas de rendimiento de cada etapa
+    root.bind("<Control-Shift-D>", lambda event: abrir_panel_trazas(root))
+    root.after(0, perfil_arranque.imprimir_reporte)
     root.mainloop()
 
 if __name__ == "__main__":
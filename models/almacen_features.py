@@ -0,0 +1,119 @@
+import os, sys, json, hashlib, threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Almacén en disco de características por archivo de audio. La clave combina
+# el hash del contenido del archivo y los parámetros de extracción, de modo
+# que un archivo movido o renombrado reutiliza sus características y un
+# cambio de parámetros no mezcla resultados viejos.
+DIRECTORIO = os.path.join(os.path.dirname(__file__), "features")
+TAM_LECTURA = 1 << 20
+
+def hash_archivo(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for bloque in iter(lambda: f.read(TAM_LECTURA), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+def hash_parametros(parametros):
+    texto = json.dumps(parametros, sort_keys=True)
+    return hashlib.sha1(texto.encode()).hexdigest()[:12]
+
+def _extraer(path, parametros):
+    # Se ejecuta en un proceso hijo: importa lo mínimo necesario
+    from core.predict import extract_features
+    return extract_features(path, **parametros)
+
+class AlmacenFeatures:
+    def __init__(self, parametros=None, directorio=DIRECTORIO):
+        self.parametros = dict(parametros or {"n_mfcc": 13})
+        self.directorio = os.path.join(directorio, hash_parametros(self.parametros))
+        os.makedirs(self.directorio, exist_ok=True)
+        with open(os.path.join(self.directorio, "parametros.json"), "w") as f:
+            json.dump(self.parametros, f, sort_keys=True)
+
+        # Índice (ruta, mtime, tamaño) -> hash para no releer archivos sin cambios
+        self._path_indice = os.path.join(directorio, "indice_hash.json")
+        self._lock = threading.Lock()
+        try:
+            with open(self._path_indice) as f:
+                self._indice = json.load(f)
+        except (OSError, ValueError):
+            self._indice = {}
+
+    def _clave_indice(self, path):
+        st = os.stat(path)
+        return f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+
+    def hash(self, path):
+        clave = self._clave_indice(path)
+        with self._lock:
+            if clave in self._indice:
+                return self._indice[clave]
+        h = hash_archivo(path)
+        with self._lock:
+            self._indice[clave] = h
+        return h
+
+    def guardar_indice(self):
+        with self._lock:
+            tmp = self._path_indice + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self._indice, f)
+            os.replace(tmp, self._path_indice)
+
+    def _ruta(self, h):
+        return os.path.join(self.directorio, h + ".npy")
+
+    def obtener(self, path):
+        ruta = self._ruta(self.hash(path))
+        return np.load(ruta) if os.path.exists(ruta) else None
+
+    def guardar(self, path, features):
+        ruta = self._ruta(self.hash(path))
+        # Escritura atómica: un proceso interrumpido no deja archivos a medias
+        tmp = ruta + ".tmp.npy"
+        np.save(tmp, np.asarray(features, dtype=np.float64))
+        os.replace(tmp, ruta)
+
+    def extraer(self, archivos, procesos=None, verbose=True):
+        # Devuelve {ruta: características}; los archivos que fallan se omiten
+        archivos = list(archivos)
+        resultado, pendientes = {}, []
+        for path in archivos:
+            features = self.obtener(path)
+            if features is None:
+                pendientes.append(path)
+            else:
+                resultado[path] = features
+
+        if verbose:
+            print(f"Características en caché: {len(resultado)}, por extraer: {len(pendientes)}")
+
+        if pendientes:
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                futuros = {pool.submit(_extraer, path, self.parametros): path for path in pendientes}
+                for i, futuro in enumerate(as_completed(futuros), 1):
+                    path = futuros[futuro]
+                    try:
+                        features = futuro.result()
+                    except Exception as e:
+                        print(f"Error procesando {path}: {e}")
+                        continue
+                    self.guardar(path, features)
+                    resultado[path] = features
+                    if verbose and i % 50 == 0:
+                        print(f"  {i}/{len(pendientes)} extraídos")
+
+        self.guardar_indice()
+        return resultado
+
+# Bloque para ejecución independiente desde consola
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m models.almacen_features carpeta_audio/")
+    else:
+        carpeta = sys.argv[1]
+        archivos = [os.path.join(carpeta, n) for n in sorted(os.listdir(carpeta)) if n.endswith(".wav")]
+        print(f"{len(AlmacenFeatures().extraer(archivos))} archivos con características")
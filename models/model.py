@@ -1,107 +1,133 @@
-import os, librosa, joblib
+import os, sys, joblib
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.svm import SVC
 from sklearn.metrics import classification_report, confusion_matrix
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Se cargan las etiquetas desde la base de datos de sonidos resiratorios
-labels = pd.read_csv(
-    "/home/zeckre/Descargas/respiratory_sound_database/Respiratory_Sound_Database/patient_diagnosis.csv",
-    header=None, names=["patient_id","label"]
-)
-
-labels_binary = labels[labels['label'].isin(['Healthy','COPD'])]
-label_dict = dict(zip(labels_binary['patient_id'], labels_binary['label']))
-
-# Se extrae MFCC
-def extract_features(file_path, n_mfcc=13):
-    try:
-        y, sr = librosa.load(file_path, sr=None)
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
-        return np.mean(mfcc.T, axis=0)
-    except Exception as e:
-        print(f"Error procesando {file_path}: {e}")
-        return None
-
-# Dataset, tomado de la base de datos de sonidos resiratorios
-X, y = [], []
-audio_folder = "/home/zeckre/Descargas/respiratory_sound_database/Respiratory_Sound_Database/audio_and_txt_files/"
-
-for filename in os.listdir(audio_folder):
-    if filename.endswith(".wav"):
-        pid_str = filename.split("_")[0]
+from models.almacen_features import AlmacenFeatures
+
+# Base de datos de sonidos respiratorios
+BASE = "/home/zeckre/Descargas/respiratory_sound_database/Respiratory_Sound_Database/"
+ARCHIVO_DIAGNOSTICO = os.path.join(BASE, "patient_diagnosis.csv")
+AUDIO_FOLDER = os.path.join(BASE, "audio_and_txt_files/")
+MODELO = os.path.join(os.path.dirname(__file__), "modelo_svm.pkl")
+
+# Parámetros de extracción: forman parte de la clave del almacén de características
+PARAMETROS = {"n_mfcc": 13}
+
+# Rejilla de hiperparámetros para la búsqueda opcional (--buscar)
+REJILLA = {
+    "svm__C": [0.1, 1, 10, 100],
+    "svm__gamma": ["scale", 0.01, 0.1, 1],
+}
+
+def cargar_etiquetas(path=ARCHIVO_DIAGNOSTICO):
+    # Se cargan las etiquetas desde la base de datos de sonidos respiratorios
+    labels = pd.read_csv(path, header=None, names=["patient_id", "label"])
+    labels_binary = labels[labels['label'].isin(['Healthy', 'COPD'])]
+    return dict(zip(labels_binary['patient_id'], labels_binary['label']))
+
+def listar_audios(audio_folder, label_dict):
+    archivos, y = [], []
+    for filename in sorted(os.listdir(audio_folder)):
+        if not filename.endswith(".wav"):
+            continue
         try:
-            pid = int(pid_str)
+            pid = int(filename.split("_")[0])
         except ValueError:
             continue
-
         if pid in label_dict:
-            label = label_dict[pid]
-            wav_path = os.path.join(audio_folder, filename)
-            feat = extract_features(wav_path)
-            if feat is not None:
-                X.append(feat)
-                y.append(0 if label=="Healthy" else 1)
-
-X = np.vstack(X)
-y = np.array(y)
-
-print("Dataset original:", X.shape, "Healthy:", sum(y==0), "COPD:", sum(y==1))
-
-# Balanceo de los datos con menor cantidad de muestras
-healthy_idx = np.where(y==0)[0]
-copd_count = sum(y==1)
-healthy_count = len(healthy_idx)
-
-factor = copd_count // healthy_count
-print("Duplicando Healthy por factor:", factor)
-
-X_balanced = np.vstack([X] + [X[healthy_idx]]*factor)
-y_balanced = np.concatenate([y] + [y[healthy_idx]]*factor)
-
-print("Dataset balanceado:", X_balanced.shape)
-
-# Datos para Train y Test
-X_train, X_test, y_train, y_test = train_test_split(
-    X_balanced, y_balanced, test_size=0.2, random_state=42, stratify=y_balanced
-)
-
-# Pipeline (Scaler + SVM)
-# Normaliza -> Entrena el modelo
-pipeline = Pipeline([
-    ("scaler", StandardScaler()),
-    ("svm", SVC(kernel='rbf', C=1, gamma='scale'))
-])
-pipeline.fit(X_train, y_train)
-
-# Matriz de confusion (Evaluación del modelo)
-y_pred = pipeline.predict(X_test)
-print(classification_report(y_test, y_pred, target_names=['Healthy','COPD']))
-
-cm = confusion_matrix(y_test, y_pred)
-plt.figure(figsize=(5,4))
-ax = sns.heatmap(cm, annot=True, fmt="d", cmap="Blues",
-            xticklabels=['Healthy','COPD'],
-            yticklabels=['Healthy','COPD'],
-            annot_kws={"size":32})
-plt.xlabel("Predicted", fontsize=32)
-plt.ylabel("True", fontsize=32)
-plt.title("Matriz de confusión SVM balanceado", fontsize=32)
-plt.xticks(fontsize=24)
-plt.yticks(fontsize=24)
-
-# Ajustar tamaño de los números en la barra de color
-cbar = ax.collections[0].colorbar
-cbar.ax.tick_params(labelsize=24)
-
-plt.tight_layout()
-plt.show()
-
-# Guardar el modelo entrenado
-joblib.dump(pipeline, "./models/modelo_svm.pkl")
-print("Modelo guardado como modelo_svm.pkl")
+            archivos.append(os.path.join(audio_folder, filename))
+            y.append(0 if label_dict[pid] == "Healthy" else 1)
+    return archivos, y
+
+def construir_dataset(audio_folder=AUDIO_FOLDER, path_etiquetas=ARCHIVO_DIAGNOSTICO, procesos=None):
+    archivos, etiquetas = listar_audios(audio_folder, cargar_etiquetas(path_etiquetas))
+    # Solo se extraen en paralelo los archivos nuevos o modificados
+    features = AlmacenFeatures(PARAMETROS).extraer(archivos, procesos)
+
+    X, y = [], []
+    for path, etiqueta in zip(archivos, etiquetas):
+        if path in features:
+            X.append(features[path])
+            y.append(etiqueta)
+    return np.vstack(X), np.array(y)
+
+def balancear(X, y):
+    # Balanceo de los datos con menor cantidad de muestras
+    healthy_idx = np.where(y == 0)[0]
+    factor = sum(y == 1) // len(healthy_idx)
+    print("Duplicando Healthy por factor:", factor)
+    return (np.vstack([X] + [X[healthy_idx]] * factor),
+            np.concatenate([y] + [y[healthy_idx]] * factor))
+
+def crear_pipeline():
+    # Pipeline (Scaler + SVM)
+    # Normaliza -> Entrena el modelo
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("svm", SVC(kernel='rbf', C=1, gamma='scale'))
+    ])
+
+def entrenar(X_train, y_train, buscar=False, n_jobs=-1):
+    pipeline = crear_pipeline()
+    if not buscar:
+        return pipeline.fit(X_train, y_train)
+
+    # Búsqueda de hiperparámetros en paralelo sobre las características ya en caché
+    busqueda = GridSearchCV(pipeline, REJILLA, cv=5, scoring="f1_macro", n_jobs=n_jobs)
+    busqueda.fit(X_train, y_train)
+    print("Mejores parámetros:", busqueda.best_params_,
+          f"(f1 macro CV = {busqueda.best_score_:.3f})")
+    return busqueda.best_estimator_
+
+def mostrar_matriz(y_test, y_pred):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    cm = confusion_matrix(y_test, y_pred)
+    plt.figure(figsize=(5,4))
+    ax = sns.heatmap(cm, annot=True, fmt="d", cmap="Blues",
+                xticklabels=['Healthy','COPD'],
+                yticklabels=['Healthy','COPD'],
+                annot_kws={"size":32})
+    plt.xlabel("Predicted", fontsize=32)
+    plt.ylabel("True", fontsize=32)
+    plt.title("Matriz de confusión SVM balanceado", fontsize=32)
+    plt.xticks(fontsize=24)
+    plt.yticks(fontsize=24)
+
+    # Ajustar tamaño de los números en la barra de color
+    cbar = ax.collections[0].colorbar
+    cbar.ax.tick_params(labelsize=24)
+
+    plt.tight_layout()
+    plt.show()
+
+# Uso: python -m models.model [--buscar] [--sin-grafica] [carpeta_audio]
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    audio_folder = argumentos[0] if argumentos else AUDIO_FOLDER
+
+    X, y = construir_dataset(audio_folder)
+    print("Dataset original:", X.shape, "Healthy:", sum(y==0), "COPD:", sum(y==1))
+
+    X_balanced, y_balanced = balancear(X, y)
+    print("Dataset balanceado:", X_balanced.shape)
+
+    # Datos para Train y Test
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_balanced, y_balanced, test_size=0.2, random_state=42, stratify=y_balanced
+    )
+    pipeline = entrenar(X_train, y_train, buscar="--buscar" in sys.argv)
+
+    # Matriz de confusion (Evaluación del modelo)
+    y_pred = pipeline.predict(X_test)
+    print(classification_report(y_test, y_pred, target_names=['Healthy','COPD']))
+    if "--sin-grafica" not in sys.argv:
+        mostrar_matriz(y_test, y_pred)
+
+    # Guardar el modelo entrenado
+    joblib.dump(pipeline, MODELO)
+    print("Modelo guardado como modelo_svm.pkl")
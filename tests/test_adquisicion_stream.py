@@ -0,0 +1,30 @@
+import os
+import numpy as np
+from core.adquisicion_stream import AdquisicionStream, BufferCircular
+from core.fuentes_adc import FuenteSimulada
+
+class FuenteSinDispositivo(FuenteSimulada):
+    # Como un LectorSpi cuyo dispositivo no se puede abrir
+    def abrir(self):
+        raise OSError("No se pudo abrir /dev/spidev0.0")
+
+def test_adquisicion_sin_muestras_no_deja_archivo(tmp_path, capsys):
+    nombre = str(tmp_path / "x.csv")
+    stream = AdquisicionStream(nombre, 1000, FuenteSinDispositivo([0], 8000)).iniciar()
+    stream.esperar()
+
+    assert not os.path.exists(stream.path_bin)
+    assert not os.path.exists(nombre)
+    assert "No se registraron muestras" in capsys.readouterr().out
+
+def test_bloque_mayor_que_la_capacidad_cuenta_perdidas_una_vez():
+    buffer = BufferCircular(4)
+    buffer.escribir(np.arange(10, dtype=np.uint16))
+    assert buffer.perdidas == 6
+    assert list(buffer.leer(4)) == [6, 7, 8, 9]
+
+    # Con muestras sin leer, también se pierden las que el bloque desplaza
+    buffer.escribir(np.arange(2, dtype=np.uint16))
+    buffer.escribir(np.arange(5, dtype=np.uint16))
+    assert buffer.perdidas == 6 + 3
+    assert list(buffer.leer(4)) == [1, 2, 3, 4]
@@ -1,18 +1,23 @@
-import spidev
-
-def check_spi(bus=0, device=0):
+def sondear_spi(bus=0, device=0):
+    # Abre el bus, envía un comando mínimo y lo cierra; lanza la excepción si falla
+    # (sin spidev instalado, p. ej. fuera de la Raspberry, falla con ImportError)
+    import spidev
+    spi = spidev.SpiDev()
+    spi.open(bus, device)
     try:
-        spi = spidev.SpiDev()
-        spi.open(bus, device)
         spi.max_speed_hz = 1000000
         spi.mode = 0
 
         # Enviar comando mínimo
         resp = spi.xfer2([0x01, 0x80, 0x00])
+    finally:
         spi.close()
 
-        # Si recibimos 3 bytes, asumimos comunicación OK
-        return len(resp) == 3
+    # Si recibimos 3 bytes, asumimos comunicación OK
+    return len(resp) == 3
 
+def check_spi(bus=0, device=0):
+    try:
+        return sondear_spi(bus, device)
     except Exception:
         return False
@@ -31,12 +31,12 @@ def calcular_fft(senal, fs):
     return freqs[:N//2], fft_vals[:N//2]
 
 if __name__ == "__main__":
+    from core.remuestreo import senal_uniforme
     ruta_csv = "/home/zeckre/Videos/Domingo2.csv"
-    fs = 6400 
-    
 
-    # 1. Cargar señal
-    tiempo, senal = cargar_csv(ruta_csv)
+    # 1. Cargar señal en rejilla uniforme, a su Fs real
+    uniforme = senal_uniforme(ruta_csv)
+    tiempo, senal, fs = uniforme.tiempo, uniforme.voltios, uniforme.fs
     senal = senal - np.mean(senal)
     # 2. FFT original
     freqs, fft_vals = calcular_fft(senal, fs)
@@ -0,0 +1,91 @@
+import threading, time
+from contextlib import contextmanager
+
+# Coordinación del bus SPI entre la adquisición y el monitor del dispositivo.
+# Quien adquiere toma el candado durante toda la captura y marca la
+# adquisición como activa; el monitor nunca espera por el candado.
+candado_spi = threading.Lock()
+_adquisiciones = {"activas": 0}
+_lock_contador = threading.Lock()
+
+# Intervalo entre sondeos del dispositivo
+INTERVALO_S = 1.0
+
+def adquisicion_activa():
+    return _adquisiciones["activas"] > 0
+
+@contextmanager
+def uso_adquisicion():
+    with _lock_contador:
+        _adquisiciones["activas"] += 1
+    try:
+        with candado_spi:
+            yield
+    finally:
+        with _lock_contador:
+            _adquisiciones["activas"] -= 1
+
+class MonitorSpi:
+    def __init__(self, sonda, intervalo=INTERVALO_S):
+        # sonda() devuelve True si el dispositivo responde o lanza una excepción
+        self.sonda = sonda
+        self.intervalo = intervalo
+        self._estado = {
+            "conectado": None, "adquiriendo": False, "ultimo_visto": None,
+            "sondeos": 0, "errores": 0, "omitidos": 0, "latencia_ms": None,
+            "ultimo_error": None,
+        }
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    @property
+    def estado(self):
+        # Copia instantánea para la interfaz: leerla nunca toca el bus
+        with self._lock:
+            return dict(self._estado)
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            self._sondear()
+            self._detener.wait(self.intervalo)
+
+    def _sondear(self):
+        # Durante una adquisición el dispositivo está en uso: no se sondea y
+        # se da por visto (la propia captura demuestra que responde)
+        if adquisicion_activa() or not candado_spi.acquire(blocking=False):
+            with self._lock:
+                self._estado["omitidos"] += 1
+                self._estado["adquiriendo"] = True
+                self._estado["conectado"] = True
+                self._estado["ultimo_visto"] = time.time()
+            return
+
+        t0 = time.perf_counter()
+        try:
+            ok = self.sonda()
+            error = None if ok else "sin respuesta"
+        except Exception as e:
+            ok, error = False, str(e)
+        finally:
+            candado_spi.release()
+        latencia = (time.perf_counter() - t0) * 1000
+
+        with self._lock:
+            self._estado["sondeos"] += 1
+            self._estado["adquiriendo"] = False
+            self._estado["conectado"] = ok
+            self._estado["latencia_ms"] = latencia
+            if ok:
+                self._estado["ultimo_visto"] = time.time()
+            else:
+                self._estado["errores"] += 1
+                self._estado["ultimo_error"] = error
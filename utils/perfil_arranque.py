@@ -0,0 +1,71 @@
+import time, sys, importlib
+from contextlib import contextmanager
+
+# Referencia lo más cercana posible al inicio del proceso
+_T0 = time.perf_counter()
+
+# (categoría, nombre, segundos, paquetes nuevos)
+_registros = []
+# Fin del arranque (primer reporte); lo que se mida después es construcción diferida
+_estado = {"fin": None, "marca_fin": 0}
+
+def _paquetes():
+    # Paquetes de terceros y del proyecto ya importados (sin la biblioteca estándar)
+    nombres = {nombre.split(".")[0] for nombre in sys.modules}
+    return {n for n in nombres if not n.startswith("_") and n not in sys.stdlib_module_names}
+
+@contextmanager
+def medir(categoria, nombre):
+    antes = _paquetes()
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        nuevos = sorted(_paquetes() - antes)
+        _registros.append((categoria, nombre, time.perf_counter() - t, nuevos))
+
+def importar(modulo):
+    with medir("import", modulo):
+        return importlib.import_module(modulo)
+
+def marca():
+    # Posición actual del registro, para reportar solo lo medido desde aquí
+    return len(_registros)
+
+def reporte(desde=None):
+    # Sin 'desde': el arranque y, aparte, lo construido después. Con 'desde'
+    # (una marca()): solo lo medido desde ese punto
+    if desde is None:
+        if _estado["fin"] is None:
+            return _texto(time.perf_counter() - _T0, _registros)
+        total = _estado["fin"] - _T0
+        texto = _texto(total, _registros[:_estado["marca_fin"]])
+        if len(_registros) > _estado["marca_fin"]:
+            texto += "\n" + _texto(None, _registros[_estado["marca_fin"]:])
+        return texto
+    return _texto(None, _registros[desde:])
+
+def _texto(total, registros):
+    if total is None:
+        lineas = ["Construcción diferida:"]
+    else:
+        lineas = [f"Tiempo de arranque: {total * 1000:.0f} ms"]
+    for categoria in ("import", "pestaña"):
+        filas = [r for r in registros if r[0] == categoria]
+        if not filas:
+            continue
+        lineas.append(f"  Por {categoria}:")
+        for _, nombre, segundos, nuevos in sorted(filas, key=lambda r: -r[2]):
+            extra = f"  [{', '.join(nuevos)}]" if nuevos else ""
+            lineas.append(f"    {segundos * 1000:8.1f} ms  {nombre}{extra}")
+    return "\n".join(lineas)
+
+def arranque_terminado():
+    return _estado["fin"] is not None
+
+def imprimir_reporte(desde=None):
+    # A la consola original: stdout puede estar redirigido a la caja de logs
+    if _estado["fin"] is None:
+        _estado["fin"] = time.perf_counter()
+        _estado["marca_fin"] = len(_registros)
+    print(reporte(desde), file=sys.__stdout__, flush=True)
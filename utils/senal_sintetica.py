@@ -0,0 +1,50 @@
+import numpy as np
+from scipy.signal import butter, sosfilt
+
+# Señal sintética parecida a una auscultación: ruido respiratorio filtrado y
+# modulado por el ciclo de respiración, ruidos cardíacos S1/S2, sibilancias
+# en la espiración y crepitantes aislados
+FS = 8000
+FRECUENCIA_RESPIRATORIA = 0.25   # Hz (15 respiraciones por minuto)
+FRECUENCIA_CARDIACA = 1.2        # Hz (72 latidos por minuto)
+
+def _rafaga(fs, duracion, f0, amplitud, rng):
+    n = int(duracion * fs)
+    t = np.arange(n) / fs
+    return amplitud * np.hanning(n) * np.sin(2 * np.pi * f0 * t + rng.uniform(0, 2 * np.pi))
+
+def auscultacion(duracion_s, fs=FS, semilla=0, amplitud=0.5):
+    rng = np.random.default_rng(semilla)
+    n = int(duracion_s * fs)
+    t = np.arange(n) / fs
+
+    # Ruido respiratorio de banda 100-1000 Hz con envolvente de inspiración/espiración
+    sos = butter(4, [100, min(1000, 0.45 * fs)], btype="bandpass", fs=fs, output="sos")
+    ciclo = np.sin(2 * np.pi * FRECUENCIA_RESPIRATORIA * t)
+    senal = 0.3 * sosfilt(sos, rng.standard_normal(n)) * (0.3 + 0.7 * np.abs(ciclo))
+
+    # Sibilancia tonal (~400 Hz) durante la espiración
+    senal += 0.05 * np.sin(2 * np.pi * 400 * t) * np.clip(-ciclo, 0, None)
+
+    # Ruidos cardíacos: S1 y S2 como ráfagas graves cortas
+    for latido in np.arange(0, duracion_s, 1 / FRECUENCIA_CARDIACA):
+        for retardo, f0 in ((0.0, 60), (0.3, 90)):
+            inicio = int((latido + retardo) * fs)
+            rafaga = _rafaga(fs, 0.06, f0, 0.8, rng)
+            fin = min(inicio + len(rafaga), n)
+            if inicio < n:
+                senal[inicio:fin] += rafaga[:fin - inicio]
+
+    # Crepitantes: transitorios muy cortos en posiciones aleatorias
+    for inicio in rng.integers(0, n, size=max(int(duracion_s * 2), 1)):
+        rafaga = _rafaga(fs, 0.004, 600, 0.4, rng)
+        fin = min(inicio + len(rafaga), n)
+        senal[inicio:fin] += rafaga[:fin - inicio]
+
+    senal *= amplitud / np.max(np.abs(senal))
+    return t, senal
+
+def a_codigos(voltios, vref=3.0, bits=12):
+    # Códigos de ADC equivalentes con la señal centrada en media escala
+    escala = vref / (2 ** bits - 1)
+    return np.clip(np.round((voltios + vref / 2) / escala), 0, 2 ** bits - 1).astype(np.uint16)
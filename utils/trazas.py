@@ -0,0 +1,123 @@
+import os, sys, time, json, threading, functools
+from collections import deque
+from contextlib import nullcontext
+
+# Tramos de tiempo de las etapas del flujo (adquisición, carga, DSP,
+# características, predicción y dibujo). Se guardan en un anillo en memoria
+# y se exportan en el formato de trazas de Chrome (chrome://tracing, Perfetto).
+# Desactivadas, tramo() devuelve siempre el mismo contexto vacío: el costo es
+# una consulta a un dict por etapa.
+CAPACIDAD = 20000
+
+_estado = {"activo": bool(os.environ.get("AUSC_TRAZAS"))}
+# (nombre, categoría, inicio_ns, duración_ns, id del hilo, argumentos)
+_tramos = deque(maxlen=CAPACIDAD)
+_hilos = {}
+_T0 = time.perf_counter_ns()
+_NULO = nullcontext()
+
+class _Tramo:
+    __slots__ = ("nombre", "categoria", "args", "inicio")
+
+    def __init__(self, nombre, categoria, args):
+        self.nombre = nombre
+        self.categoria = categoria
+        self.args = args
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tipo, *exc):
+        fin = time.perf_counter_ns()
+        tid = threading.get_ident()
+        if tid not in _hilos:
+            _hilos[tid] = threading.current_thread().name
+        if tipo is not None:
+            self.args = {**(self.args or {}), "error": tipo.__name__}
+        # deque.append es atómico: no hace falta candado entre hilos
+        _tramos.append((self.nombre, self.categoria, self.inicio, fin - self.inicio, tid, self.args))
+
+def activas():
+    return _estado["activo"]
+
+def activar(activo=True):
+    _estado["activo"] = activo
+
+def tramo(nombre, categoria="app", **args):
+    if not _estado["activo"]:
+        return _NULO
+    return _Tramo(nombre, categoria, args or None)
+
+def trazar(categoria, nombre=None):
+    # Decorador: un tramo por llamada con el nombre calificado de la función
+    def decorador(funcion):
+        etiqueta = nombre or f"{funcion.__module__}.{funcion.__qualname__}"
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _estado["activo"]:
+                return funcion(*args, **kwargs)
+            with _Tramo(etiqueta, categoria, None):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+def tramos():
+    # Copia del anillo, del más antiguo al más reciente
+    return list(_tramos)
+
+def limpiar():
+    _tramos.clear()
+
+def resumen():
+    # Por nombre: (categoría, llamadas, total_s, media_s, máximo_s), por total descendente
+    grupos = {}
+    for nombre, categoria, _, duracion, _, _ in tramos():
+        g = grupos.setdefault(nombre, [categoria, 0, 0, 0])
+        g[1] += 1
+        g[2] += duracion
+        g[3] = max(g[3], duracion)
+    filas = [(n, c, k, t / 1e9, t / k / 1e9, m / 1e9) for n, (c, k, t, m) in grupos.items()]
+    return sorted(filas, key=lambda f: -f[3])
+
+def texto_resumen():
+    lineas = [f"{'Tramo':<44} {'Cat.':<16} {'N':>6} {'Total ms':>10} {'Media ms':>10} {'Máx ms':>10}"]
+    for nombre, categoria, llamadas, total, media, maximo in resumen():
+        lineas.append(f"{nombre[-44:]:<44} {categoria:<16} {llamadas:6d} {total * 1000:10.1f}"
+                      f" {media * 1000:10.2f} {maximo * 1000:10.2f}")
+    return "\n".join(lineas)
+
+def exportar_chrome(path):
+    # Eventos completos ("X") en microsegundos, más los nombres de los hilos
+    pid = os.getpid()
+    eventos = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": nombre}}
+               for tid, nombre in list(_hilos.items())]
+    for nombre, categoria, inicio, duracion, tid, args in tramos():
+        evento = {"name": nombre, "cat": categoria, "ph": "X", "pid": pid, "tid": tid,
+                  "ts": (inicio - _T0) / 1000, "dur": duracion / 1000}
+        if args:
+            evento["args"] = {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in args.items()}
+        eventos.append(evento)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f)
+    return path
+
+# Bloque para ejecución independiente desde consola: traza una pasada del
+# análisis (carga, FFT, wavelet y figuras) sobre un archivo
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m utils.trazas archivo.csv [salida.json]")
+    else:
+        import matplotlib
+        matplotlib.use("Agg")
+        # Como __main__ este archivo es otro módulo: se usa el que importan las etapas
+        from utils import trazas
+        from core import cargar_graficar_csv, fft_csv, dwt_csv
+        trazas.activar()
+        cargar_graficar_csv.plot_g1(sys.argv[1])
+        fft_csv.plot_fft(sys.argv[1])
+        dwt_csv.plot_wavelet(sys.argv[1])
+        print(trazas.texto_resumen())
+        salida = sys.argv[2] if len(sys.argv) > 2 else "traza.json"
+        print(f"Traza guardada en '{trazas.exportar_chrome(salida)}'")